@@ -1,12 +1,15 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import datetime
 import os
+import time
 import re
 import json
 from collections import Counter
 from pandas.tseries.offsets import DateOffset
 from filelock import FileLock
+from PIL import Image, ImageOps
 
 # --- Configuration ---
 # Define constant file paths and directory names.
@@ -15,7 +18,10 @@ DATA_FILE = "my_cards.csv"  # CSV file to store all card data
 TAGS_FILE = "my_tags.json"  # JSON file for the master list of user-defined tags
 IMAGE_DIR = "card_images"   # Directory to store card images
 DEFAULT_IMAGE = "default.png" # A fallback image if a card's image is missing
+DEFAULT_IMAGE_PATH = os.path.join(IMAGE_DIR, DEFAULT_IMAGE)
 LOCK_FILE = f"{DATA_FILE}.lock" # <--- ADDED LOCK FILE
+MAX_IMAGE_SIZE = (800, 800) # Uploaded card images are shrunk to fit inside this box
+CARDS_PER_PAGE = 10 # Cards shown per page in the "All My Cards" list
 
 # --- App Constants ---
 # Constants for date formatting and data schema
@@ -37,6 +43,30 @@ DATE_COLUMNS = [
 MONTH_NAMES = ["January", "February", "March", "April", "May", "June",
                "July", "August", "September", "October", "November", "December"]
 MONTH_MAP = {f"{i+1:02d}": name for i, name in enumerate(MONTH_NAMES)}
+# Used to convert 'May' -> 4 (0 = January) for due-date sorting
+MONTH_INDEX = {name: i for i, name in enumerate(MONTH_NAMES)}
+
+# Welcome bonus statuses, in the order they appear in the selectbox.
+# The index map lets the edit form find the default option without a list scan.
+BONUS_STATUS_OPTIONS = ("Not Started", "In Progress", "Met", "Received")
+BONUS_STATUS_INDEX = {status: i for i, status in enumerate(BONUS_STATUS_OPTIONS)}
+
+# Regexes for form validation, image file names and CSV clean-up,
+# compiled once here instead of on every form submit / data load
+EXPIRY_MM_RE = re.compile(r"^(0[1-9]|1[0-2])$") # '01'-'12'
+EXPIRY_YY_RE = re.compile(r"^\d{2}$")
+LAST_4_DIGITS_RE = re.compile(r"^\d{4}$")
+NON_ALNUM_RE = re.compile(r'[^a-zA-Z0-9]')
+TRAILING_DOT_ZERO_RE = re.compile(r'\.0$')
+
+# HTML for each card's header on the dashboard: Title on the left, Expiry on the right.
+# Built once here and filled in per card with .format().
+CARD_HEADER_TMPL = (
+    '<div style="display: flex; justify-content: space-between; align-items: baseline; margin-bottom: -10px;">'
+    '<h3 style="margin-bottom: 0px;">{title}</h3>'
+    '<span style="opacity: 0.8; white-space: nowrap;"><b>Card Expiry:</b> {expiry}</span>'
+    '</div>'
+)
 
 # This is the master list of *all* columns in the DataFrame.
 # It defines the "schema" for our CSV file.
@@ -73,6 +103,26 @@ COLUMN_DTYPES = {
     "LastFeeActionYear": "int",
     "LastFeeAction": "object" # Set as 'object' (string)
 }
+# Text columns are read from the CSV as strings, so pandas never guesses a
+# numeric type for them (e.g. Last 4 Digits "0123" -> 123.0).
+TEXT_COLUMNS = [col for col, dtype in COLUMN_DTYPES.items() if dtype == "object"]
+# Values used to fill blanks (or unparseable numbers) when loading the CSV
+COLUMN_DEFAULTS = {
+    "Sort Order": 99, "Notes": "", "Tags": "", "Bonus Offer": "",
+    "Min Spend": 0.0, "Bonus Status": "", "Last 4 Digits": "",
+    "Current Spend": 0.0, "FeeWaivedCount": 0, "FeePaidCount": 0,
+    "LastFeeActionYear": 0, "LastFeeAction": ""
+}
+
+# Derived column added by load_data(): each card's tags as a frozenset,
+# parsed once per CSV load. It is *not* part of the CSV schema and is
+# dropped again before saving/exporting.
+TAG_SET_COLUMN = "_tag_set"
+
+# Prefixes of session state keys that are created per card (by index):
+# the 2-step Cancel/Delete confirmations and the sort page's inputs.
+# clear_per_card_state() removes them when leaving the dashboard.
+PER_CARD_STATE_PREFIXES = ("confirm_cancel_card_", "confirm_permanent_delete_", "sort_")
 
 # --- Setup: Create data file and directories if they don't exist ---
 # This is a one-time setup that runs when the app starts.
@@ -91,52 +141,83 @@ if not os.path.exists(IMAGE_DIR):
 # We use it here to manage which "page" is shown, what card is being
 # edited, and other UI-related states.
 
-# "Page" routing flags
-if 'show_add_form' not in st.session_state:
-    st.session_state.show_add_form = False # Show the "Add Card" page
-if 'show_edit_form' not in st.session_state:
-    st.session_state.show_edit_form = False # Show the "Edit Card" page
-if 'show_sort_form' not in st.session_state:
-    st.session_state.show_sort_form = False # Show the "Sort Order" page
-if 'show_details_page' not in st.session_state:
-    st.session_state.show_details_page = False # Show the "Card Details" page
-if 'show_tag_manager' not in st.session_state:
-    st.session_state.show_tag_manager = False # Show the "Manage Tags" page
-
-# Data state for passing info between pages
-if 'card_to_edit' not in st.session_state:
-    st.session_state.card_to_edit = None # Stores the DataFrame *index* of the card to edit
-if 'card_to_view' not in st.session_state:
-    st.session_state.card_to_view = None # Stores the *index* of the card to view
-if 'card_to_delete' not in st.session_state:
-    st.session_state.card_to_delete = None # Stores the *index* for the 2-step cancel confirmation
-
-# UI state for forms
-if 'date_format' not in st.session_state:
-    st.session_state.date_format = "DD/MM/YYYY" # User's preferred date format
-if 'add_method' not in st.session_state:
-    st.session_state.add_method = "Choose from list" # Toggle on the "Add Card" page
-if 'card_to_add_selection' not in st.session_state:
-    st.session_state.card_to_add_selection = None # The selected card from the dropdown
-if 'duplicate_sort_numbers' not in st.session_state:
-    st.session_state.duplicate_sort_numbers = [] # Used to show errors on the Sort page
-
-# Session state for live image preview
-# This is a common Streamlit pattern. We need to store the uploaded image
-# in session state *before* the form is submitted to show a live preview.
+SESSION_DEFAULTS = {
+    # "Page" routing flags
+    'show_add_form': False,         # Show the "Add Card" page
+    'show_edit_form': False,        # Show the "Edit Card" page
+    'show_sort_form': False,        # Show the "Sort Order" page
+    'show_details_page': False,     # Show the "Card Details" page
+    'show_tag_manager': False,      # Show the "Manage Tags" page
+
+    # Data state for passing info between pages
+    'card_to_edit': None,   # Stores the DataFrame *index* of the card to edit
+    'card_to_view': None,   # Stores the *index* of the card to view
+    'spend_to_update': None, # Stores the *index* of the bonus whose spend form is open
+    'card_list_page': 0,     # Current page (0-based) of the "All My Cards" list
+
+    # UI state for forms
+    'date_format': "DD/MM/YYYY",          # User's preferred date format
+    'add_method': "Choose from list",     # Toggle on the "Add Card" page
+    'card_to_add_selection': None,        # The selected card from the dropdown
+    'duplicate_sort_numbers': [],         # Used to show errors on the Sort page
+
+    # Session state for live image preview
+    # This is a common Streamlit pattern. We need to store the uploaded image
+    # in session state *before* the form is submitted to show a live preview.
+    'uploaded_image_preview': None, # Stores the UploadedFile object
+}
+for key, default in SESSION_DEFAULTS.items():
+    st.session_state.setdefault(key, default)
 if 'image_uploader_key' not in st.session_state:
     # We use a changing key to "reset" the file uploader widget
-    st.session_state.image_uploader_key = str(datetime.now().timestamp())
-if 'uploaded_image_preview' not in st.session_state:
-    st.session_state.uploaded_image_preview = None # Stores the UploadedFile object
+    st.session_state.image_uploader_key = str(time.time())
 
 # =============================================================================
 #  Helper Functions
 # =============================================================================
 
-def load_data():
+@st.cache_resource
+def get_data_lock():
+    """
+    Returns the one FileLock on LOCK_FILE shared by every session in this
+    process, instead of building a new lock object for each read/write.
+    The lock file itself still keeps us in step with the Telegram bot.
+    """
+    return FileLock(LOCK_FILE)
+
+
+def get_data_version():
+    """
+    Returns a token that changes whenever DATA_FILE is rewritten, whether
+    by this app or by the Telegram bot (bot.py). Used as a cache key.
+    """
+    stat = os.stat(DATA_FILE)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def load_data(data_version=None):
     """
     Loads the card data from the CSV file (DATA_FILE).
+
+    The parsed DataFrame is cached per version of the file, so Streamlit
+    reruns (every button click) don't re-read and re-parse the CSV.
+    Each call still returns its own copy, which callers are free to modify.
+
+    Args:
+        data_version: A token from get_data_version(). Pass the one you
+            also use as a cache key elsewhere (see show_dashboard), so the
+            key always matches the data; by default the current version.
+    """
+    if data_version is None:
+        data_version = get_data_version()
+    return _load_data_cached(data_version)
+
+
+@st.cache_data(show_spinner=False, max_entries=2) # Current file version (+ the one before it)
+def _load_data_cached(data_version):
+    """
+    Reads and cleans the CSV file. Called through load_data();
+    'data_version' is only used as the cache key.
     
     This function also performs:
     1.  **Data Migration:** Adds any new columns (from ALL_COLUMNS) that
@@ -146,78 +227,179 @@ def load_data():
     """
     try:
         # <--- SAFETY FIX: Added FileLock here
-        with FileLock(LOCK_FILE):
-            df = pd.read_csv(DATA_FILE)
+        with get_data_lock():
+            df = pd.read_csv(DATA_FILE, dtype=dict.fromkeys(TEXT_COLUMNS, str))
     except pd.errors.EmptyDataError:
         # If the file is empty (e.g., user deleted all rows), create a new empty DF
         df = pd.DataFrame(columns=ALL_COLUMNS)
         df = df.astype(COLUMN_DTYPES)
+        df[TAG_SET_COLUMN] = parse_tag_sets(df["Tags"])
         return df
 
     # --- Data Migration ---
-    # This block checks for missing columns and adds them with a default value.
+    # This block adds any columns that are missing from the CSV.
     # This allows the app to be updated with new features (new columns)
     # without breaking compatibility with an existing user's CSV file.
-    if "Sort Order" not in df.columns:
-        df["Sort Order"] = range(1, len(df) + 1)
-    if "Notes" not in df.columns:
-        df["Notes"] = ""
-    if "Cancellation Date" not in df.columns:
-        df["Cancellation Date"] = pd.NaT
-    if "Re-apply Date" not in df.columns:
-        df["Re-apply Date"] = pd.NaT
-    if "Tags" not in df.columns:
-        df["Tags"] = ""
-    if "Bonus Offer" not in df.columns:
-        df["Bonus Offer"] = ""
-    if "Min Spend" not in df.columns:
-        df["Min Spend"] = 0.0
-    if "Min Spend Deadline" not in df.columns:
-        df["Min Spend Deadline"] = pd.NaT
-    if "Bonus Status" not in df.columns:
-        df["Bonus Status"] = ""
-    if "Last 4 Digits" not in df.columns:
-        df["Last 4 Digits"] = ""
-    if "Current Spend" not in df.columns:
-        df["Current Spend"] = 0.0
-    if "FeeWaivedCount" not in df.columns:
-        df["FeeWaivedCount"] = 0
-    if "FeePaidCount" not in df.columns:
-        df["FeePaidCount"] = 0
-    if "LastFeeActionYear" not in df.columns:
-        df["LastFeeActionYear"] = 0
-    if "LastFeeAction" not in df.columns:
-        df["LastFeeAction"] = ""
+    # An up-to-date CSV (the usual case) skips it after one list scan.
+    missing_columns = [col for col in ALL_COLUMNS if col not in df.columns]
+    if missing_columns:
+        # New columns start blank; the Type Coercion step below fills them
+        # from COLUMN_DEFAULTS (and blank dates become NaT)
+        df = df.reindex(columns=[*df.columns, *missing_columns])
+        if "Sort Order" in missing_columns:
+            df["Sort Order"] = range(1, len(df) + 1) # Keep the current row order
         
     # --- Type Coercion ---
     # This block cleans the data loaded from the CSV.
     # CSVs don't store types well (e.g., dates become strings, numbers
     # might be read as objects). This enforces our schema.
     for col in DATE_COLUMNS:
-        df[col] = pd.to_datetime(df[col], errors='coerce') # 'coerce' turns bad dates into NaT (Not a Time)
-
-    df["Sort Order"] = pd.to_numeric(df["Sort Order"], errors='coerce').fillna(99).astype(int)
-    df["Notes"] = df["Notes"].fillna("").astype(str)
-    df["Tags"] = df["Tags"].fillna("").astype(str)
-    df["Bonus Offer"] = df["Bonus Offer"].fillna("").astype(str)
-    df["Min Spend"] = pd.to_numeric(df["Min Spend"], errors='coerce').fillna(0.0).astype(float)
-    df["Bonus Status"] = df["Bonus Status"].fillna("").astype(str)
-    df["Last 4 Digits"] = df["Last 4 Digits"].fillna("").astype(str)
+        # Both the app and the bot write dates through pandas, so they are
+        # always ISO 8601; the format hint skips per-element inference.
+        df[col] = pd.to_datetime(df[col], errors='coerce', format='ISO8601', cache=True) # 'coerce' turns bad dates into NaT (Not a Time)
+
+    # Text columns were already read as strings (see TEXT_COLUMNS).
+    # Numbers the bot or a hand edit left unparseable become NaN here...
+    for col, default in COLUMN_DEFAULTS.items():
+        if not isinstance(default, str):
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    # ...and all blanks get their column's default in one pass
+    df = df.fillna(COLUMN_DEFAULTS)
     # Fix for cases where '1234.0' was saved
-    df["Last 4 Digits"] = df["Last 4 Digits"].str.replace(r'\.0$', '', regex=True)
-    df["Current Spend"] = pd.to_numeric(df["Current Spend"], errors='coerce').fillna(0.0).astype(float)
-    df["FeeWaivedCount"] = pd.to_numeric(df["FeeWaivedCount"], errors='coerce').fillna(0).astype(int)
-    df["FeePaidCount"] = pd.to_numeric(df["FeePaidCount"], errors='coerce').fillna(0).astype(int)
-    df["LastFeeActionYear"] = pd.to_numeric(df["LastFeeActionYear"], errors='coerce').fillna(0).astype(int)
-    df["LastFeeAction"] = df["LastFeeAction"].fillna("").astype(str)
+    df["Last 4 Digits"] = df["Last 4 Digits"].str.replace(TRAILING_DOT_ZERO_RE, '', regex=True)
 
     # This ensures all columns match the master dtype list,
-    # catching any dtypes missed by manual coercion (like 'Annual Fee')
-    # and correctly typing the empty DataFrame on first load.
+    # catching any dtypes not set above (like 'Annual Fee' or the int
+    # counters) and correctly typing the empty DataFrame on first load.
     df = df.astype(COLUMN_DTYPES)
+    df[TAG_SET_COLUMN] = parse_tag_sets(df["Tags"])
     return df
 
 
+def parse_tag_sets(tags):
+    """
+    Splits a Series of comma-separated tag strings ("Cash,Travel") into
+    frozensets of tag names, ignoring blanks.
+    """
+    return tags.str.split(',').map(
+        lambda tag_list: frozenset(t.strip() for t in tag_list if t.strip())
+    )
+
+
+def to_datetime64(*date_vals):
+    """
+    Converts st.date_input values (dates or None) into numpy datetime64s
+    with a single vectorized pd.to_datetime call.
+
+    A *typed* NaT keeps the column's datetime dtype when a row is appended
+    with df.loc, whereas None/pd.NaT would turn it into an object column.
+    """
+    return pd.to_datetime(list(date_vals), errors='coerce').to_numpy()
+
+
+def save_data_to_csv(df):
+    """
+    Saves the card DataFrame back to the CSV file (DATA_FILE).
+
+    The CSV text is built *before* taking the FileLock, so the lock
+    (which the Telegram bot also waits on) is only held for the actual
+    file write, not for pandas' serialization.
+
+    The text goes to a temporary file that then replaces DATA_FILE, so a
+    crash mid-write can't leave a half-written CSV. When the CSV is a
+    single-file Docker bind mount it can't be replaced (EBUSY), so we fall
+    back to writing it in place.
+    """
+    csv_text = df.drop(columns=TAG_SET_COLUMN, errors="ignore").to_csv(index=False, lineterminator="\n")
+    tmp_file = DATA_FILE + ".tmp"
+    # <--- SAFETY FIX: Added FileLock here
+    with get_data_lock():
+        with open(tmp_file, "w", encoding="utf-8", newline="") as f:
+            f.write(csv_text)
+        try:
+            os.replace(tmp_file, DATA_FILE)
+        except OSError:
+            os.remove(tmp_file)
+            with open(DATA_FILE, "w", encoding="utf-8", newline="") as f:
+                f.write(csv_text)
+    clear_data_caches()
+
+
+def append_card_to_csv(df):
+    """
+    Saves a DataFrame whose only change is one new card added as its last row.
+
+    If the CSV on disk already has the current column layout, just that row
+    is appended to the file instead of rewriting every card. Otherwise (e.g.
+    an older CSV that load_data() migrated in memory) it falls back to a
+    full save_data_to_csv().
+    """
+    csv_df = df.drop(columns=TAG_SET_COLUMN, errors="ignore")
+    header = csv_df.head(0).to_csv(index=False, lineterminator="\n").encode("utf-8")
+    row = csv_df.tail(1).to_csv(index=False, header=False, lineterminator="\n").encode("utf-8")
+
+    appended = False
+    with get_data_lock():
+        try:
+            with open(DATA_FILE, "rb+") as f:
+                if f.readline() == header:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n": # Hand-edited file without a final newline
+                        f.write(b"\n")
+                    f.write(row)
+                    appended = True
+        except FileNotFoundError:
+            pass
+    if appended:
+        clear_data_caches()
+    else:
+        save_data_to_csv(df)
+
+
+def clear_data_caches():
+    """Drops every cached copy of the card data after DATA_FILE is written."""
+    _load_data_cached.clear()
+    get_bank_options.clear()
+    filter_and_sort.clear()
+
+
+def update_card(index, updates):
+    """
+    Applies a few column updates to a single card and saves the CSV.
+
+    Args:
+        index: The DataFrame index of the card to update.
+        updates (dict): Maps column names to their new values.
+    """
+    df = load_data()
+    for col, val in updates.items():
+        df.at[index, col] = val
+    save_data_to_csv(df)
+
+
+@st.cache_data(show_spinner=False, max_entries=1)
+def get_export_csv_bytes(data_version):
+    """
+    Returns the cards as UTF-8 CSV bytes for the sidebar "Export" button.
+    Cached on the CSV version, so the cards are only loaded and serialized
+    again after the data changes, not on every rerun.
+    """
+    df = _load_data_cached(data_version)
+    return df.drop(columns=TAG_SET_COLUMN).to_csv(index=False).encode('utf-8')
+
+
+def iter_cards(df):
+    """
+    Loops over a DataFrame as (index, card) pairs, like iterrows(), but
+    each card is a plain dict instead of a freshly built pd.Series.
+
+    itertuples() would be faster still, but most of our column names
+    contain spaces and would come back as positional fields (_1, _2...),
+    so dicts let us keep the card['Bank'] / card.get(...) lookups.
+    """
+    return zip(df.index, df.to_dict("records"))
+
+
 def prettify_bank_name(bank_name):
     """Converts file-safe bank names (e.g., 'AmericanExpress') to display-friendly names."""
     if bank_name == "StandardChartered":
@@ -231,30 +413,160 @@ def get_card_mapping():
     """
     Scans the IMAGE_DIR for card images (png, jpg).
     It parses filenames like "BankName_Card_Name.png" into a dictionary:
-    { "BankName Card Name": "BankName_Card_Name.png" }
-    This dictionary populates the "Choose from list" dropdown.
+    { "BankName Card Name": ("BankName_Card_Name.png", "BankName", "Card Name") }
+    i.e. display name -> (image filename, bank, card name).
+    This dictionary populates the "Choose from list" dropdown, and the add
+    form takes the new card's bank and name straight from it.
+
+    The parsing is cached on the directory listing (see _build_card_mapping),
+    so it only reruns when image files are added or removed.
     """
-    card_mapping = {}
     try:
-        for filename in os.listdir(IMAGE_DIR):
-            if filename.endswith((".png", ".jpg", ".jpeg")) and filename != DEFAULT_IMAGE:
-                base_name = os.path.splitext(filename)[0] # Remove extension
-                parts = base_name.split("_")
-                if len(parts) >= 2:
-                    bank_raw = parts[0]
-                    bank = prettify_bank_name(bank_raw) # Make name display-friendly
-                    card_name = " ".join(parts[1:])
-                    display_name = f"{bank} {card_name}"
-                    card_mapping[display_name] = filename
+        filenames = tuple(sorted(get_image_set()))
     except FileNotFoundError:
         st.error(f"Image directory '{IMAGE_DIR}' not found. Please create it.")
-    return card_mapping
+        return {}
+    return _build_card_mapping(filenames)
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def _build_card_mapping(filenames):
+    """
+    Parses image filenames into the card mapping. Called through get_card_mapping().
+    The mapping is returned sorted by display name, so the add form can use
+    its keys as dropdown options without sorting them on every rerun.
+    """
+    card_mapping = {}
+    for filename in filenames:
+        if filename.endswith((".png", ".jpg", ".jpeg")) and filename != DEFAULT_IMAGE:
+            base_name = os.path.splitext(filename)[0] # Remove extension
+            parts = base_name.split("_")
+            if len(parts) >= 2:
+                bank_raw = parts[0]
+                bank = prettify_bank_name(bank_raw) # Make name display-friendly
+                card_name = " ".join(parts[1:])
+                display_name = f"{bank} {card_name}"
+                card_mapping[display_name] = (filename, bank, card_name)
+    return dict(sorted(card_mapping.items()))
+
+
+def get_image_set():
+    """
+    Returns the set of filenames in IMAGE_DIR, cached so pages don't stat
+    every card's image on each rerun.
+    The cache is keyed on the folder's modification time, which changes
+    whenever a file is added, removed or renamed (by the app or by hand),
+    so one stat() call per rerun is enough to keep it fresh.
+    """
+    return _get_image_set_cached(os.stat(IMAGE_DIR).st_mtime_ns)
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _get_image_set_cached(image_dir_mtime):
+    """
+    Cached worker for get_image_set(). image_dir_mtime is only used as the
+    cache key. (A cache_resource is fine here: the frozenset is shared, not
+    copied, and can't be mutated by callers.)
+    """
+    return frozenset(os.listdir(IMAGE_DIR))
+
+
+def image_path_or_default(image_filename):
+    """
+    Returns the full path to a card image, falling back to DEFAULT_IMAGE if
+    the file is missing. Returns None if neither exists.
+    Uses the cached get_image_set() instead of os.path.exists().
+    """
+    image_files = get_image_set()
+    image_filename = str(image_filename)
+    if image_filename in image_files:
+        return os.path.join(IMAGE_DIR, image_filename)
+    if DEFAULT_IMAGE in image_files:
+        return DEFAULT_IMAGE_PATH
+    return None
+
+
+def load_image_bytes(path):
+    """
+    Reads an image file into memory once and caches the bytes.
+    Used for image previews so reruns don't re-read the file from disk.
+    The cache is keyed on the file's modification time too, so an image
+    replaced on disk under the same name is picked up on the next rerun.
+    """
+    return _load_image_bytes_cached(path, os.stat(path).st_mtime_ns)
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _load_image_bytes_cached(path, image_mtime):
+    """
+    Cached worker for load_image_bytes(). image_mtime is only used as the
+    cache key. (A cache_resource is fine here, as for the image set: bytes
+    are immutable, so sharing them avoids copying the image on every rerun.)
+    """
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def save_uploaded_image(uploaded_file, bank, card_name, timestamp):
+    """
+    Re-encodes an uploaded card image with Pillow and saves it to IMAGE_DIR.
+
+    The image is shrunk to fit MAX_IMAGE_SIZE and compressed once here, so the
+    dashboard doesn't re-read a multi-MB phone photo on every rerun.
+    Images with transparency stay PNG (to keep rounded card corners),
+    everything else is saved as JPEG. The file is written under a ".tmp"
+    name and renamed into place, so a failed save never leaves a torn
+    image behind.
+
+    Returns the new filename, or None if the image could not be saved.
+    """
+    # Create a file-safe name
+    bank_safe = NON_ALNUM_RE.sub('', bank)
+    card_safe = NON_ALNUM_RE.sub('', card_name)
+    # Create a unique filename to prevent overwrites
+    base_name = f"Custom_{bank_safe}_{card_safe}_{int(timestamp)}"
+
+    tmp_path = None
+    try:
+        uploaded_file.seek(0) # The preview may have already read the buffer
+        img = Image.open(uploaded_file)
+        img = ImageOps.exif_transpose(img) # Keep phone photos upright once EXIF is dropped
+        img.thumbnail(MAX_IMAGE_SIZE)
+
+        has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+        image_filename = f"{base_name}.png" if has_alpha else f"{base_name}.jpg"
+        image_path = os.path.join(IMAGE_DIR, image_filename)
+        tmp_path = image_path + ".tmp" # Not a .png/.jpg, so the card list ignores it
+        if has_alpha:
+            img.save(tmp_path, format="PNG", optimize=True)
+        else:
+            img.convert("RGB").save(tmp_path, format="JPEG", quality=85, optimize=True)
+        os.replace(tmp_path, image_path)
+    except Exception as e:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        st.error(f"Error saving image: {e}")
+        return None
+    _get_image_set_cached.clear() # Make the new file visible to the dashboard
+    return image_filename
 
 
 def load_tags():
-    """Loads the master list of tags from TAGS_FILE (tags.json)."""
-    if not os.path.exists(TAGS_FILE):
+    """
+    Loads the master list of tags from TAGS_FILE (tags.json).
+    Cached on the file's modification time, so the JSON is only parsed again
+    after it changes.
+    """
+    try:
+        tags_mtime = os.path.getmtime(TAGS_FILE)
+    except OSError: # File doesn't exist (yet)
         return []
+    return _load_tags_cached(tags_mtime)
+
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def _load_tags_cached(tags_mtime):
+    """Reads and de-duplicates TAGS_FILE. Called through load_tags()."""
     try:
         with open(TAGS_FILE, 'r') as f:
             tags = json.load(f)
@@ -270,6 +582,7 @@ def save_tags(tags_list):
     try:
         with open(TAGS_FILE, 'w') as f:
             json.dump(unique_sorted_tags, f, indent=4) # indent=4 for readability
+        _load_tags_cached.clear() # mtime may not tick on fast successive saves
         return True
     except Exception as e:
         st.error(f"Failed to save tags: {e}")
@@ -279,6 +592,48 @@ def save_tags(tags_list):
 # =============================================================================
 # 1. "Add New Card" Page (Main Area)
 # =============================================================================
+def cancel_add_form():
+    """Callback for the "Cancel" button on the Add Card form."""
+    st.session_state.show_add_form = False # Go back to dashboard
+    st.session_state.uploaded_image_preview = None # Clear image preview
+    # Reset the uploader key to fully clear the widget
+    st.session_state.image_uploader_key = str(time.time())
+
+
+@st.fragment
+def card_image_uploader(label, fallback_image_path):
+    """
+    File uploader with a live image preview, used by the Add and Edit forms.
+
+    Runs as a Streamlit fragment, so choosing or removing a file only reruns
+    the uploader and its preview, not the whole page and form below it.
+    The upload is kept in st.session_state.uploaded_image_preview, where the
+    form's submit handler picks it up.
+
+    Args:
+        label (str): The file uploader's label.
+        fallback_image_path (str | None): Image shown while nothing is
+            uploaded. None shows a "No Image" caption instead.
+    """
+    uploaded_file = st.file_uploader(
+        label,
+        type=["png", "jpg", "jpeg"],
+        key=st.session_state.image_uploader_key # Use the resettable key
+    )
+
+    # When a file is uploaded, store it in session state
+    if uploaded_file is not None:
+        st.session_state.uploaded_image_preview = uploaded_file
+
+    # Show either the newly uploaded image or the fallback
+    if st.session_state.uploaded_image_preview is not None:
+        st.image(st.session_state.uploaded_image_preview)
+    elif fallback_image_path:
+        st.image(load_image_bytes(fallback_image_path))
+    else:
+        st.caption("No Image")
+
+
 def show_add_card_form(card_mapping):
     """Displays the form for adding a new card."""
     st.title("Add a New Card", anchor=False)
@@ -305,39 +660,33 @@ def show_add_card_form(card_mapping):
             st.error("No pre-listed card images found in 'card_images' folder.")
             st.session_state.card_to_add_selection = None
         else:
+            # card_mapping is already sorted by name (see _build_card_mapping)
+            sorted_card_names = list(card_mapping)
             # Set a default selection to avoid errors
-            if st.session_state.card_to_add_selection is None and card_mapping:
-                st.session_state.card_to_add_selection = sorted(card_mapping.keys())[0]
+            if st.session_state.card_to_add_selection is None:
+                st.session_state.card_to_add_selection = sorted_card_names[0]
             st.selectbox(
                 "Choose a card*",
-                options=sorted(card_mapping.keys()),
+                options=sorted_card_names,
                 key="card_to_add_selection"
             )
-            # Show the image preview for the selected card
+            # Show the image preview for the selected card.
+            # card_mapping is built from the cached image listing, so the file
+            # is known to exist; its bytes are cached too.
             if st.session_state.card_to_add_selection:
-                image_filename = card_mapping[st.session_state.card_to_add_selection]
-                st.image(os.path.join(IMAGE_DIR, image_filename))
+                image_filename = card_mapping[st.session_state.card_to_add_selection][0]
+                st.image(load_image_bytes(os.path.join(IMAGE_DIR, image_filename)))
     else:
         # If user picks "Add a custom card", show text inputs and file uploader
         st.info("Add your card details below. You can upload a custom image.")
         
         # --- Live Image Preview Logic ---
-        # The file uploader is *outside* the form.
-        uploaded_file = st.file_uploader(
-            "Upload Card Image (Optional)", 
-            type=["png", "jpg", "jpeg"],
-            key=st.session_state.image_uploader_key # Use the resettable key
+        # The file uploader is *outside* the form. Until a file is
+        # uploaded, the default image is shown.
+        card_image_uploader(
+            "Upload Card Image (Optional)",
+            DEFAULT_IMAGE_PATH if DEFAULT_IMAGE in get_image_set() else None
         )
-        
-        # When a file is uploaded, store it in session state
-        if uploaded_file is not None:
-            st.session_state.uploaded_image_preview = uploaded_file
-        
-        # Show either the newly uploaded image or the default
-        if st.session_state.uploaded_image_preview is not None:
-            st.image(st.session_state.uploaded_image_preview)
-        else:
-            st.image(os.path.join(IMAGE_DIR, DEFAULT_IMAGE))
     
     # --- The Main Form ---
     # All inputs for the new card are inside this form
@@ -367,8 +716,13 @@ def show_add_card_form(card_mapping):
         annual_fee = st.number_input("Annual Fee ($)", min_value=0.0, step=1.00, format="%.2f")
 
         # Load the master tag list for the multiselect options
+        # (no point showing an empty multiselect if there are no tags yet)
         all_tags = load_tags()
-        selected_tags = st.multiselect("Tags", options=all_tags)
+        if all_tags:
+            selected_tags = st.multiselect("Tags", options=all_tags)
+        else:
+            selected_tags = []
+            st.caption("No tags defined yet. Add some via 'Manage Tags' in the sidebar.")
 
         st.subheader("Notes", anchor=False)
         notes = st.text_area("Add any notes for this card (e.g., waiver info, benefits).")
@@ -380,7 +734,7 @@ def show_add_card_form(card_mapping):
         min_spend_deadline = st.date_input("Min Spend Deadline", value=None, format=st.session_state.date_format)
         bonus_status = st.selectbox(
             "Bonus Status",
-            ("Not Started", "In Progress", "Met", "Received"), index=0,
+            BONUS_STATUS_OPTIONS, index=0,
             help="Set this to 'Met' or 'Received' when you're done!"
         )
 
@@ -397,30 +751,23 @@ def show_add_card_form(card_mapping):
         with col1:
             submitted = st.form_submit_button("Add This Card", use_container_width=True, type="primary")
         with col2:
-            if st.form_submit_button("Cancel", use_container_width=True):
-                # On Cancel:
-                st.session_state.show_add_form = False # Go back to dashboard
-                st.session_state.uploaded_image_preview = None # Clear image preview
-                # Reset the uploader key to fully clear the widget
-                st.session_state.image_uploader_key = str(datetime.now().timestamp())
-                st.rerun()
+            # Cancel uses a callback, which runs *before* the next rerun,
+            # so that rerun goes straight to the dashboard without
+            # rebuilding this form first.
+            st.form_submit_button("Cancel", use_container_width=True, on_click=cancel_add_form)
 
     # --- Form Submission Logic ---
     # This code runs *only* after the "Add This Card" button is clicked
     if submitted:
+        submit_ts = time.time() # One timestamp for the image filename and uploader key reset
         df = load_data() # Load all existing data
         
         # 1. Determine Bank, Card Name, and Image Filename
         if st.session_state.add_method == "Choose from list":
             if not st.session_state.card_to_add_selection:
                 st.error("Please select a card from the list."); return
-            # Parse bank/card name from the selected image filename
-            image_filename = card_mapping[st.session_state.card_to_add_selection]
-            base_name = os.path.splitext(image_filename)[0]
-            parts = base_name.split("_")
-            bank_raw = parts[0]
-            bank = prettify_bank_name(bank_raw)
-            card_name = " ".join(parts[1:])
+            # Bank/card name were parsed from the image filename along with the mapping
+            image_filename, bank, card_name = card_mapping[st.session_state.card_to_add_selection]
         else:
             # Get bank/card name from text inputs
             if not bank or not card_name:
@@ -431,29 +778,18 @@ def show_add_card_form(card_mapping):
             uploaded_file = st.session_state.uploaded_image_preview # Get file from state
             
             if uploaded_file is not None:
-                # Create a file-safe name
-                bank_safe = re.sub(r'[^a-zA-Z0-9]', '', bank)
-                card_safe = re.sub(r'[^a-zA-Z0-9]', '', card_name)
-                extension = os.path.splitext(uploaded_file.name)[1]
-                # Create a unique filename to prevent overwrites
-                image_filename = f"Custom_{bank_safe}_{card_safe}_{int(datetime.now().timestamp())}{extension}"
-                save_path = os.path.join(IMAGE_DIR, image_filename)
-                
-                # Save the uploaded file to the image directory
-                try:
-                    with open(save_path, "wb") as f:
-                        f.write(uploaded_file.getbuffer())
-                except Exception as e:
-                    st.error(f"Error saving image: {e}")
+                # Shrink/re-encode the upload and save it to the image directory
+                image_filename = save_uploaded_image(uploaded_file, bank, card_name, submit_ts)
+                if image_filename is None:
                     return
 
         # 3. Validation
         # Use regex to validate expiry and last 4 digits
-        month_match = re.match(r"^(0[1-9]|1[0-2])$", expiry_mm)
+        month_match = EXPIRY_MM_RE.match(expiry_mm)
         if not month_match: st.error("Expiry MM must be a valid month (e.g., 01, 05, 12)."); return
-        year_match = re.match(r"^\d{2}$", expiry_yy)
+        year_match = EXPIRY_YY_RE.match(expiry_yy)
         if not year_match: st.error("Expiry YY must be two digits (e.g., 25, 27)."); return
-        if last_4_digits and not re.match(r"^\d{4}$", last_4_digits):
+        if last_4_digits and not LAST_4_DIGITS_RE.match(last_4_digits):
             st.error("Last 4 Digits must be exactly 4 numbers (e.g., 1234)."); return
 
         # 4. Data Preparation
@@ -468,63 +804,69 @@ def show_add_card_form(card_mapping):
             new_sort_order = int(max_sort + 1)
 
         # 5. Create New Card Record
+        # Convert all date inputs in one go (None -> NaT)
+        (applied_ts, approved_ts, received_ts, activated_ts,
+         first_charge_ts, min_spend_deadline_ts, no_date) = to_datetime64(
+            applied_date, approved_date, received_date, activated_date,
+            first_charge_date, min_spend_deadline, None
+        )
+
         # Build a dictionary for the new card
         new_card = {
             "Bank": bank, "Card Name": card_name, "Annual Fee": annual_fee,
             "Card Expiry (MM/YY)": card_expiry_mm_yy, "Month of Annual Fee": fee_month,
             "Image Filename": image_filename,
-            "Date Applied": pd.to_datetime(applied_date),
-            "Date Approved": pd.to_datetime(approved_date),
-            "Date Received Card": pd.to_datetime(received_date),
-            "Date Activated Card": pd.to_datetime(activated_date),
-            "First Charge Date": pd.to_datetime(first_charge_date),
+            "Date Applied": applied_ts,
+            "Date Approved": approved_ts,
+            "Date Received Card": received_ts,
+            "Date Activated Card": activated_ts,
+            "First Charge Date": first_charge_ts,
             "Sort Order": new_sort_order,
             "Notes": notes,
-            "Cancellation Date": pd.NaT, # New cards are not cancelled
-            "Re-apply Date": pd.NaT,
+            "Cancellation Date": no_date, # New cards are not cancelled
+            "Re-apply Date": no_date,
             "Tags": ",".join(selected_tags), # Store list as a comma-separated string
             "Bonus Offer": bonus_offer,
             "Min Spend": min_spend,
-            "Min Spend Deadline": pd.to_datetime(min_spend_deadline),
+            "Min Spend Deadline": min_spend_deadline_ts,
             "Bonus Status": bonus_status,
             "Last 4 Digits": last_4_digits,
             "Current Spend": 0.0, # New cards start at 0 spend
             "FeeWaivedCount": 0,
             "FeePaidCount": 0,
             "LastFeeActionYear": 0,
-            "LastFeeAction": ""
-            # FeeWaivedCount, FeePaidCount, etc. will be filled with
-            # their default values (0, 0, 0, "") by the .astype() call below
+            "LastFeeAction": "",
+            TAG_SET_COLUMN: frozenset(selected_tags), # Same derived column load_data() adds
         }
 
         # 6. Save to DataFrame
-        new_df = pd.DataFrame([new_card])
-        
-        # This is the *most important* step for saving.
-        # We enforce the master COLUMN_DTYPES schema on the *new row*.
-        # This ensures that when we pd.concat, the data types match
-        # the main 'df', preventing a FutureWarning and data corruption.
-        new_df = new_df.astype(COLUMN_DTYPES)
-        
-        # Add the new card row to the main DataFrame
-        df = pd.concat([df, new_df], ignore_index=True)
-        # Save the updated DataFrame back to the CSV
-        
-        # <--- SAFETY FIX: Added FileLock here
-        with FileLock(LOCK_FILE):
-            df.to_csv(DATA_FILE, index=False)
+        # Append the new card as a row directly (load_data() always returns
+        # a 0..n-1 index, so len(df) is the next free label). Every value
+        # above matches its column's dtype (Python ints for the int columns,
+        # datetime64 for dates, strings for object columns), so no column is
+        # upcast and no separate one-row DataFrame has to be built and cast.
+        df.loc[len(df)] = new_card
+        # Save the new card to the CSV (appending just its row when possible)
+        append_card_to_csv(df)
 
         # 7. Reset State and Rerun
         st.success(f"Successfully added {bank} {card_name}!")
         st.session_state.show_add_form = False # Go back to dashboard
         st.session_state.uploaded_image_preview = None # Clear image
-        st.session_state.image_uploader_key = str(datetime.now().timestamp()) # Reset key
+        st.session_state.image_uploader_key = str(submit_ts) # Reset key
         st.rerun()
 
 
 # =============================================================================
 # 2. "Edit Card" Page
 # =============================================================================
+def cancel_edit_form():
+    """Callback for the "Cancel" button on the Edit Card form."""
+    st.session_state.show_edit_form = False; st.session_state.card_to_edit = None
+    st.session_state.uploaded_image_preview = None # Clear preview
+    st.session_state.image_uploader_key = str(time.time()) # Reset key
+
+
 def show_edit_form():
     """Displays the form for editing an existing card."""
     st.title("Edit Card Details", anchor=False)
@@ -537,8 +879,9 @@ def show_edit_form():
     if card_index is None or card_index not in all_cards_df.index:
         st.error("Could not find card to edit. Returning to dashboard."); st.session_state.show_edit_form = False; st.rerun(); return
     
-    # Get the row (as a Series) for the card we are editing
-    card_data = all_cards_df.loc[card_index]
+    # Get the row for the card we are editing, as a plain dict: the form
+    # reads ~20 fields from it, and dict lookups skip Series indexing
+    card_data = all_cards_df.loc[card_index].to_dict()
 
     # Reset image preview when page loads
     if 'edit_form_loaded' not in st.session_state:
@@ -546,34 +889,20 @@ def show_edit_form():
         st.session_state.edit_form_loaded = True
     
     # Pre-fill expiry month/year from the saved "MM/YY" string
-    try:
-        default_mm, default_yy = card_data["Card Expiry (MM/YY)"].split('/')
-    except (ValueError, AttributeError):
-        default_mm, default_yy = "", "" # Handle blank/invalid data
+    # Blank/invalid data (no single '/') falls back to empty fields
+    mm, sep, yy = str(card_data["Card Expiry (MM/YY)"]).partition('/')
+    default_mm, default_yy = (mm, yy) if sep and '/' not in yy else ("", "")
 
     st.subheader(f"Editing: {card_data['Bank']} {card_data['Card Name']}", anchor=False)
     st.caption("Note: You cannot change the manual sort order here.")
     
     # File uploader and preview OUTSIDE form
-    # Same pattern as the "Add Card" page for live image preview
-    uploaded_file = st.file_uploader(
-        "Change Card Image (Optional)", 
-        type=["png", "jpg", "jpeg"],
-        key=st.session_state.image_uploader_key # Use a key that we can reset
+    # Same pattern as the "Add Card" page for live image preview;
+    # until a new file is uploaded, the card's *current* image is shown.
+    card_image_uploader(
+        "Change Card Image (Optional)",
+        image_path_or_default(card_data["Image Filename"])
     )
-    
-    if uploaded_file is not None:
-        st.session_state.uploaded_image_preview = uploaded_file
-    
-    if st.session_state.uploaded_image_preview is not None:
-        # Show the new preview
-        st.image(st.session_state.uploaded_image_preview)
-    else:
-        # Show the card's *current* image
-        current_image_path = os.path.join(IMAGE_DIR, str(card_data["Image Filename"]))
-        if not os.path.exists(current_image_path): 
-            current_image_path = os.path.join(IMAGE_DIR, DEFAULT_IMAGE)
-        st.image(current_image_path)
 
     # --- The Edit Form ---
     # All inputs are pre-filled with the card's existing data
@@ -599,11 +928,16 @@ def show_edit_form():
         annual_fee = st.number_input("Annual Fee ($)", min_value=0.0, step=1.00, format="%.2f", value=card_data["Annual Fee"])
         
         # --- FIX: Combine default tags into options list to prevent crash ---
+        # The card's tags were already split and cleaned once by load_data()
         all_tags = load_tags()
-        default_tags_str = card_data.get("Tags", "")
-        default_tags = [t.strip() for t in default_tags_str.split(',') if t.strip()]
-        combined_options = sorted(list(set(all_tags + default_tags)))
-        selected_tags = st.multiselect("Tags", options=combined_options, default=default_tags)
+        card_tag_set = card_data[TAG_SET_COLUMN]
+        default_tags = sorted(card_tag_set)
+        combined_options = sorted(card_tag_set.union(all_tags))
+        if combined_options:
+            selected_tags = st.multiselect("Tags", options=combined_options, default=default_tags)
+        else:
+            selected_tags = []
+            st.caption("No tags defined yet. Add some via 'Manage Tags' in the sidebar.")
         # ------------------------------------------------------------------
 
         st.subheader("Notes", anchor=False)
@@ -622,16 +956,16 @@ def show_edit_form():
         
         # Helper function to convert date values for the st.date_input
         # It returns None if the date is NaT, which st.date_input requires.
+        # (Dates are already Timestamps, parsed once in load_data.)
         def get_date(date_val):
-            return pd.to_datetime(date_val) if pd.notna(date_val) else None
+            return date_val if pd.notna(date_val) else None
         
         min_spend_deadline = st.date_input("Min Spend Deadline", value=get_date(card_data.get("Min Spend Deadline")), format=st.session_state.date_format)
         
         # Find the index of the current status to set the selectbox default
-        status_options = ["Not Started", "In Progress", "Met", "Received"]
         default_status = card_data.get("Bonus Status", "Not Started")
-        status_index = status_options.index(default_status) if default_status in status_options else 0
-        bonus_status = st.selectbox("Bonus Status", status_options, index=status_index)
+        status_index = BONUS_STATUS_INDEX.get(default_status, 0)
+        bonus_status = st.selectbox("Bonus Status", BONUS_STATUS_OPTIONS, index=status_index)
         
         st.write("---")
         st.subheader("Edit Optional Dates", anchor=False)
@@ -647,22 +981,19 @@ def show_edit_form():
         with col1:
             submitted = st.form_submit_button("Save Changes", use_container_width=True, type="primary")
         with col2:
-            if st.form_submit_button("Cancel", use_container_width=True):
-                # On Cancel:
-                st.session_state.show_edit_form = False; st.session_state.card_to_edit = None
-                st.session_state.uploaded_image_preview = None # Clear preview
-                st.session_state.image_uploader_key = str(datetime.now().timestamp()) # Reset key
-                st.rerun()
+            # See show_add_card_form: the callback skips rebuilding this form on Cancel
+            st.form_submit_button("Cancel", use_container_width=True, on_click=cancel_edit_form)
 
     # --- Form Submission Logic ---
     if submitted:
+        submit_ts = time.time() # One timestamp for the image filename and uploader key reset
         # 1. Validation
         if not bank or not card_name: st.error("Bank Name and Card Name are required."); return
-        month_match = re.match(r"^(0[1-9]|1[0-2])$", expiry_mm); 
+        month_match = EXPIRY_MM_RE.match(expiry_mm); 
         if not month_match: st.error("Expiry MM must be a valid month (e.g., 01, 05, 12)."); return
-        year_match = re.match(r"^\d{2}$", expiry_yy); 
+        year_match = EXPIRY_YY_RE.match(expiry_yy); 
         if not year_match: st.error("Expiry YY must be two digits (e.g., 25, 27)."); return
-        if last_4_digits and not re.match(r"^\d{4}$", last_4_digits):
+        if last_4_digits and not LAST_4_DIGITS_RE.match(last_4_digits):
             st.error("Last 4 Digits must be exactly 4 numbers (e.g., 1234)."); return
         
         # 2. Image Upload Logic for Edit
@@ -672,67 +1003,361 @@ def show_edit_form():
         
         if uploaded_file is not None:
             # If a new file *was* uploaded, save it with a new unique name
-            bank_safe = re.sub(r'[^a-zA-Z0-9]', '', bank)
-            card_safe = re.sub(r'[^a-zA-Z0-9]', '', card_name)
-            extension = os.path.splitext(uploaded_file.name)[1]
-            new_image_filename = f"Custom_{bank_safe}_{card_safe}_{int(datetime.now().timestamp())}{extension}"
-            save_path = os.path.join(IMAGE_DIR, new_image_filename)
-            
-            try:
-                with open(save_path, "wb") as f:
-                    f.write(uploaded_file.getbuffer())
-            except Exception as e:
-                st.error(f"Error saving image: {e}")
+            new_image_filename = save_uploaded_image(uploaded_file, bank, card_name, submit_ts)
+            if new_image_filename is None:
                 return
             # Note: We don't delete the old image, to be safe.
         
         card_expiry_mm_yy = f"{expiry_mm}/{expiry_yy}"
         fee_month = MONTH_MAP.get(expiry_mm)
 
+        # Convert all date inputs in one go (None -> NaT)
+        (applied_ts, approved_ts, received_ts, activated_ts,
+         first_charge_ts, min_spend_deadline_ts) = to_datetime64(
+            applied_date, approved_date, received_date, activated_date,
+            first_charge_date, min_spend_deadline
+        )
+
         # 3. Update Record in DataFrame
-        # We use .loc[] to find the specific row (by its index) and
-        # update each column with the new values from the form.
-        all_cards_df.loc[card_index, "Bank"] = bank
-        all_cards_df.loc[card_index, "Card Name"] = card_name
-        all_cards_df.loc[card_index, "Image Filename"] = new_image_filename
-        all_cards_df.loc[card_index, "Annual Fee"] = annual_fee
-        all_cards_df.loc[card_index, "Card Expiry (MM/YY)"] = card_expiry_mm_yy
-        all_cards_df.loc[card_index, "Month of Annual Fee"] = fee_month
-        all_cards_df.loc[card_index, "Date Applied"] = pd.to_datetime(applied_date)
-        all_cards_df.loc[card_index, "Date Approved"] = pd.to_datetime(approved_date)
-        all_cards_df.loc[card_index, "Date Received Card"] = pd.to_datetime(received_date)
-        all_cards_df.loc[card_index, "Date Activated Card"] = pd.to_datetime(activated_date)
-        all_cards_df.loc[card_index, "First Charge Date"] = pd.to_datetime(first_charge_date)
-        all_cards_df.loc[card_index, "Notes"] = notes
-        all_cards_df.loc[card_index, "Tags"] = ",".join(selected_tags)
-        all_cards_df.loc[card_index, "Bonus Offer"] = bonus_offer
-        all_cards_df.loc[card_index, "Min Spend"] = min_spend
-        all_cards_df.loc[card_index, "Min Spend Deadline"] = pd.to_datetime(min_spend_deadline)
-        all_cards_df.loc[card_index, "Bonus Status"] = bonus_status
-        all_cards_df.loc[card_index, "Last 4 Digits"] = last_4_digits
-        all_cards_df.loc[card_index, "Current Spend"] = current_spend
+        # Collect the new values from the form, then write them into the
+        # card's row (found by its index) with a single .loc assignment.
+        edits = {
+            "Bank": bank,
+            "Card Name": card_name,
+            "Image Filename": new_image_filename,
+            "Annual Fee": annual_fee,
+            "Card Expiry (MM/YY)": card_expiry_mm_yy,
+            "Month of Annual Fee": fee_month,
+            "Date Applied": applied_ts,
+            "Date Approved": approved_ts,
+            "Date Received Card": received_ts,
+            "Date Activated Card": activated_ts,
+            "First Charge Date": first_charge_ts,
+            "Notes": notes,
+            "Tags": ",".join(selected_tags),
+            "Bonus Offer": bonus_offer,
+            "Min Spend": min_spend,
+            "Min Spend Deadline": min_spend_deadline_ts,
+            "Bonus Status": bonus_status,
+            "Last 4 Digits": last_4_digits,
+            "Current Spend": current_spend,
+        }
+        all_cards_df.loc[card_index, list(edits)] = list(edits.values())
 
         # 4. Save, Reset State, and Rerun
-        # <--- SAFETY FIX: Added FileLock here
-        with FileLock(LOCK_FILE):
-            all_cards_df.to_csv(DATA_FILE, index=False)
+        save_data_to_csv(all_cards_df)
             
         st.success(f"Successfully updated {bank} {card_name}!"); 
         st.session_state.show_edit_form = False; st.session_state.card_to_edit = None
         st.session_state.uploaded_image_preview = None # Clear preview
-        st.session_state.image_uploader_key = str(datetime.now().timestamp()) # Reset key
+        st.session_state.image_uploader_key = str(submit_ts) # Reset key
         st.rerun()
 
 
 # =============================================================================
 # 3. Main Dashboard Page
 # =============================================================================
-def show_dashboard(all_cards_df, show_cancelled):
+@st.cache_data(show_spinner=False, max_entries=4) # 2 data versions x show_cancelled on/off
+def get_bank_options(_cards_df, data_version, show_cancelled):
+    """
+    Returns the sorted list of banks for the dashboard's "Filter by Bank"
+    box. Cached like filter_and_sort(): `_cards_df` is not hashed, and
+    `data_version` + `show_cancelled` identify which cards it holds.
+    """
+    return sorted(_cards_df['Bank'].unique())
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def filter_and_sort(_cards_df, data_version, show_cancelled, current_month_index,
+                    selected_banks, selected_tags, sort_logic, strftime_code):
+    """
+    Applies the dashboard's bank/tag filters and sort to the card list, and
+    precomputes the per-card display strings used by the main card loop.
+
+    `_cards_df` is not hashed by Streamlit (leading underscore); the other
+    arguments are the cache key. `data_version`, `show_cancelled` and
+    `current_month_index` together identify which rows and due_sort_key
+    values `_cards_df` holds, so they must always be passed.
+
+    Args:
+        _cards_df (pd.DataFrame): The cards shown on the dashboard, with
+                                  'due_sort_key' already computed.
+        selected_banks (tuple): Banks to keep (empty = all).
+        selected_tags (tuple): Tags a card must *all* have (empty = any).
+        sort_logic (str): A value from the dashboard's "Sort by" options.
+        strftime_code (str): The user's chosen date display format.
+    """
+    df = _cards_df
+    if selected_banks:
+        # Filter DataFrame to rows where 'Bank' is in the selected list
+        df = df[df['Bank'].isin(selected_banks)]
+    if selected_tags:
+        # This logic handles multi-tag filtering:
+        # the card must have *every* tag in selected_tags (a subset test)
+        # (the per-card tag sets are parsed once in load_data)
+        selected_tag_set = frozenset(selected_tags)
+        df = df[df[TAG_SET_COLUMN].map(selected_tag_set.issubset).astype(bool)]
+
+    # --- Apply Sort ---
+    if sort_logic == "Annual Fee_desc":
+        df = df.sort_values(by="Annual Fee", ascending=False)
+    elif sort_logic == "Annual Fee_asc":
+        df = df.sort_values(by="Annual Fee", ascending=True)
+    elif sort_logic == "due_sort_key":
+        # Sort by our calculated 'due_sort_key'
+        df = df.sort_values(by="due_sort_key", ascending=True)
+    else: # Default: "Sort Order"
+        df = df.sort_values(by="Sort Order", ascending=True)
+
+    # Precompute every per-card display string in one vectorized pass,
+    # so the card loop only looks values up instead of formatting them.
+    # NaT dates format to NaN, which we show as an empty string.
+    def fmt_dates(col, code=strftime_code):
+        return lambda d: d[col].dt.strftime(code).fillna('')
+
+    return df.assign(
+        name_full=lambda d: d['Bank'].astype(str) + ' ' + d['Card Name'].astype(str),
+        applied_fmt=fmt_dates('Date Applied'),
+        approved_fmt=fmt_dates('Date Approved'),
+        received_fmt=fmt_dates('Date Received Card'),
+        activated_fmt=fmt_dates('Date Activated Card'),
+        first_charge_fmt=fmt_dates('First Charge Date'),
+        cancelled_fmt=fmt_dates('Cancellation Date', '%d %b %Y'),
+        reapply_fmt=fmt_dates('Re-apply Date', '%d %b %Y'),
+    )
+
+
+def clear_per_card_state():
+    """
+    Drops every per-card session key (see PER_CARD_STATE_PREFIXES), so no
+    card is left half-way through a confirmation and the keys don't pile
+    up over a long session.
+    """
+    for key in [k for k in st.session_state if k.startswith(PER_CARD_STATE_PREFIXES)]:
+        del st.session_state[key]
+
+
+def set_cancel_confirm(index, confirm):
+    """
+    Callback for "Cancel Card" / "Cancel Action": shows (or hides) the
+    Confirm Cancel buttons for a card.
+
+    The flag is kept per card, like the delete confirmation: render_card()
+    is a fragment, so a click only redraws *that* card, and a flag shared
+    between cards would leave another card showing stale buttons.
+    """
+    if not confirm:
+        st.session_state.pop(f"confirm_cancel_card_{index}", None)
+        return
+    st.session_state[f"confirm_cancel_card_{index}"] = True
+    st.session_state.pop(f"confirm_permanent_delete_{index}", None) # One confirmation at a time
+    st.session_state.card_to_edit = None
+
+
+def set_delete_confirm(index, confirm):
+    """Callback for "Delete Permanently" / "No, Keep Card" on a card."""
+    if not confirm:
+        # Drop the flag rather than storing False, so session state doesn't
+        # keep one entry per card ever touched
+        st.session_state.pop(f"confirm_permanent_delete_{index}", None)
+        return
+    st.session_state[f"confirm_permanent_delete_{index}"] = True
+    st.session_state.pop(f"confirm_cancel_card_{index}", None) # One confirmation at a time
+    st.session_state.card_to_edit = None # Clear other states
+
+
+def change_card_list_page(step):
+    """Callback for the "Previous" / "Next" buttons under the card list."""
+    st.session_state.card_list_page += step
+
+
+def set_spend_to_update(index):
+    """
+    Callback for "Log Spend" / "Close": opens (or closes, if index is None)
+    the spend-update form for one bonus in the tracker.
+    """
+    st.session_state.spend_to_update = index
+
+
+@st.fragment
+def render_card(index, card_row, current_month_index, next_month_index):
+    """
+    Displays one card in the "All My Cards" list, with its action buttons.
+
+    Runs as a Streamlit fragment, so the buttons that only show/hide this
+    card's confirm step (handled by on_click callbacks) rerun just this
+    card. Buttons that change the data or switch pages still call
+    st.rerun() for the whole app, since the summary and trackers above
+    depend on them.
+
+    Args:
+        index: The DataFrame index of the card.
+        card_row (dict): The card's row from filter_and_sort().
+        current_month_index (int): 0-11 index of this month.
+        next_month_index (int): 0-11 index of next month.
+    """
+    st.divider()
+    col1, col2 = st.columns([1, 3])
+
+    with col1: # Image column
+        image_path = image_path_or_default(card_row["Image Filename"])
+        if image_path: 
+            st.image(image_path)
+        else: 
+            st.caption("No Image")
+
+    with col2: # Info column
+        
+        # --- Title/Expiry UI ---
+        title_text = card_row['name_full']
+        last_4 = card_row.get("Last 4 Digits", "")
+        if last_4:
+            title_text += f" ({last_4})" # Add (1234) if it exists
+        
+        # This custom HTML places the Title on the left and Expiry on the right
+        st.markdown(
+            CARD_HEADER_TMPL.format(title=title_text, expiry=card_row['Card Expiry (MM/YY)']),
+            unsafe_allow_html=True
+        )
+
+        is_cancelled = pd.notna(card_row["Cancellation Date"])
+        
+        if is_cancelled:
+            # --- Cancelled Card View ---
+            st.error("Status: Cancelled")
+            c_col1, c_col2 = st.columns(2)
+            with c_col1:
+                st.metric("Cancelled On", card_row["cancelled_fmt"])
+            with c_col2:
+                st.metric("Re-apply After", card_row["reapply_fmt"])
+        else:
+            # --- Active Card View ---
+            st.metric(label="Annual Fee", value=f"${card_row['Annual Fee']:.2f}")
+
+        # --- Due date status ---
+        due_month_name = card_row['Month of Annual Fee']
+        due_month_index = card_row['due_month_index'] 
+        if not is_cancelled:
+            if due_month_index == current_month_index:
+                st.error(f"❗ **Due this month** ({due_month_name})")
+            elif due_month_index == next_month_index:
+                st.warning(f"⚠️ **Due next month** ({due_month_name})")
+            elif due_month_index != -1:
+                st.info(f"✅ Due in {due_month_name}")
+            else:
+                st.info(f"Due in {due_month_name}") # Fallback
+        
+        # Display tags if they exist
+        tags_str = card_row.get("Tags", "")
+        if tags_str:
+            st.markdown(f"**Tags:** `{tags_str.replace(',', ', ')}`")
+
+        # Display notes if they exist
+        notes = card_row.get("Notes", "")
+        if notes and pd.notna(notes):
+            st.markdown("**Notes:**")
+            st.markdown(notes)
+
+        # --- Button Bar ---
+        st.write("")  # Spacer
+        
+        # <--- LAYOUT FIX: Use equal widths and container_width=True
+        b_col1, b_col2, b_col3, b_col4 = st.columns([1, 1, 1, 1])
+        
+        with b_col1: # Details button
+            if st.button("Details", key=f"details_{index}", use_container_width=True):
+                # "Go" to the details page by setting its flag and the card index
+                st.session_state.card_to_view = index; st.session_state.show_details_page = True; st.session_state.card_to_edit = None; clear_per_card_state(); st.rerun()
+        
+        with b_col2: # Edit button
+            if st.button("Edit", key=f"edit_{index}", use_container_width=True):
+                # "Go" to the edit page
+                st.session_state.card_to_edit = index; st.session_state.show_edit_form = True; clear_per_card_state()
+                st.session_state.edit_form_loaded = False # Reset edit form preview
+                st.rerun()
+        
+        with b_col3: # Cancel/Re-activate button
+            if is_cancelled:
+                # --- Re-activate Button ---
+                if st.button("Re-activate", key=f"reactivate_{index}", use_container_width=True):
+                    update_card(index, {
+                        # Clear the cancellation/re-apply dates
+                        "Cancellation Date": pd.NaT,
+                        "Re-apply Date": pd.NaT,
+                        # Reset the fee action year so it shows as due again
+                        "LastFeeActionYear": 0,
+                        "LastFeeAction": "",
+                    })
+                    st.success(f"Re-activated {card_row['name_full']}.")
+                    st.rerun()
+            else:
+                # --- Cancel Button (2-step) ---
+                # Step 1: User clicks "Cancel Card"
+                # We set this card's 'confirm_cancel_card_<index>' flag
+                if st.session_state.get(f"confirm_cancel_card_{index}", False):
+                    # Step 2: The page reruns, and now this block is active
+                    # Show the confirmation buttons
+                    if st.button("Confirm Cancel", key=f"confirm_cancel_{index}", type="primary", use_container_width=True):
+                        cancel_date = pd.to_datetime('today')
+                        # Set re-apply to 13 months from now (a safe buffer)
+                        reapply_date = cancel_date + DateOffset(months=13)
+                        update_card(index, {
+                            "Cancellation Date": cancel_date,
+                            "Re-apply Date": reapply_date,
+                        })
+                        st.session_state.pop(f"confirm_cancel_card_{index}", None) # Clear state
+                        st.success(f"Cancelled {card_row['name_full']}.")
+                        st.rerun()
+                    st.button("Cancel Action", key=f"cancel_cancel_{index}", use_container_width=True,
+                              on_click=set_cancel_confirm, args=(index, False))
+                else:
+                    # Step 1: Show the initial "Cancel Card" button
+                    st.button("Cancel Card", key=f"cancel_{index}", use_container_width=True,
+                              on_click=set_cancel_confirm, args=(index, True))
+        
+        with b_col4: # Delete button (2-step)
+            # This uses a *different* session state key per card for confirmation
+            if st.session_state.get(f"confirm_permanent_delete_{index}", False):
+                # Step 2: Show confirmation buttons
+                if st.button("CONFIRM DELETE", key=f"confirm_delete_permanent_{index}", type="primary", use_container_width=True):
+                    df = load_data()
+                    # Use .drop() to permanently remove the row
+                    df = df.drop(index).reset_index(drop=True)
+                    
+                    save_data_to_csv(df)
+                    # reset_index() shifts later cards up, so every per-card
+                    # flag must go or it would belong to another card
+                    clear_per_card_state()
+                    st.success(f"Permanently deleted {card_row['name_full']}.")
+                    st.rerun()
+                st.button("No, Keep Card", key=f"cancel_delete_permanent_{index}", use_container_width=True,
+                          on_click=set_delete_confirm, args=(index, False))
+            else:
+                # Step 1: Show initial "Delete" button
+                st.button("Delete Permanently", key=f"delete_permanent_{index}", use_container_width=True,
+                          on_click=set_delete_confirm, args=(index, True))
+
+        # --- Expander for Other Dates ---
+        with st.expander("Show All Dates and Details"):
+            d_col1, d_col2, d_col3 = st.columns(3)
+            with d_col1:
+                st.metric("Date Applied", card_row["applied_fmt"])
+                st.metric("Date Approved", card_row["approved_fmt"])
+            with d_col2:
+                st.metric("Date Received", card_row["received_fmt"])
+                st.metric("Date Activated", card_row["activated_fmt"])
+            with d_col3:
+                st.metric("First Charge Date", card_row["first_charge_fmt"])
+
+
+def show_dashboard(all_cards_df, data_version, show_cancelled):
     """
     Displays the main dashboard, including summaries, trackers, and the card list.
     
     Args:
         all_cards_df (pd.DataFrame): The complete DataFrame of all cards.
+        data_version: The get_data_version() token all_cards_df was loaded
+                      with; the cached helpers below use it as their key.
         show_cancelled (bool): A flag from the sidebar, True if we should
                                include cancelled cards in the list.
     """
@@ -750,28 +1375,34 @@ def show_dashboard(all_cards_df, show_cancelled):
     current_year = today_dt.year # Get current year for fee tracking
 
     # Filter the DataFrame based on the "Show Cancelled" checkbox
+    # (no .copy() needed: the derived columns below are added with .assign,
+    # which already returns a new frame)
     if show_cancelled:
-        cards_to_display_df = all_cards_df.copy()
+        cards_to_display_df = all_cards_df
         st.info("Showing all cards, including cancelled.")
     else:
         # Keep only cards where 'Cancellation Date' is NaT (null)
-        cards_to_display_df = all_cards_df[pd.isna(all_cards_df['Cancellation Date'])].copy()
+        cards_to_display_df = all_cards_df.loc[all_cards_df['Cancellation Date'].isna()]
+
+    # Add the derived due-month columns used for sorting/filtering:
+    # - 'due_month_index' is the month index (0-11), looked up in
+    #   MONTH_INDEX. Unknown/blank months get -1.
+    # - 'due_sort_key' is the key for "Sort by Due Date". It wraps around,
+    #   so if the current month is November (10), December (11) gets key 1,
+    #   and January (0) gets key 2. ( (0 - 10 + 12) % 12 = 2 )
+    cards_to_display_df = cards_to_display_df.assign(
+        due_month_index=lambda d: d['Month of Annual Fee'].map(MONTH_INDEX).fillna(-1).astype('int8'),
+        due_sort_key=lambda d: (d['due_month_index'] - current_month_index + 12) % 12,
+    )
 
     # --- Summary Metrics ---
     st.header("Summary", anchor=False)
     
-    # Helper to convert "MonthName" to an index (0-11)
-    def get_month_index(month_name):
-        try: return MONTH_NAMES.index(month_name)
-        except (ValueError, TypeError): return -1
-            
-    # Create a new column for the month index (0-11) for sorting/filtering
-    cards_to_display_df['due_month_index'] = cards_to_display_df['Month of Annual Fee'].apply(get_month_index)
-    
     # Calculate fees due *this* calendar year (from this month onward)
-    cards_due_this_year_df = cards_to_display_df[cards_to_display_df['due_month_index'] >= current_month_index]
-    count_due_this_year = len(cards_due_this_year_df)
-    amount_due_this_year = cards_due_this_year_df['Annual Fee'].sum()
+    # (a numpy mask over the two columns we need, not a filtered copy of every column)
+    due_this_year_mask = cards_to_display_df['due_month_index'].to_numpy() >= current_month_index
+    count_due_this_year = int(due_this_year_mask.sum())
+    amount_due_this_year = float(cards_to_display_df['Annual Fee'].to_numpy()[due_this_year_mask].sum())
 
     col1, col2, col3, col4 = st.columns(4)
     col1.metric("Total Cards (Active)" if not show_cancelled else "Total Cards (All)", len(cards_to_display_df))
@@ -784,50 +1415,60 @@ def show_dashboard(all_cards_df, show_cancelled):
     st.header("Welcome Bonus Tracker", anchor=False)
     st.caption("Shows active bonuses with a status of 'Not Started' or 'In Progress'.")
     
-    # Filter for cards that have a deadline AND are not yet 'Met' or 'Received'
-    active_bonuses_df = cards_to_display_df[
-        (pd.notna(cards_to_display_df['Min Spend Deadline'])) &
+    # Filter for cards that have a deadline AND are not yet 'Met' or 'Received',
+    # dropping expired bonuses. Cards with no deadline get NaN 'Days Left',
+    # which fails the >= 0 test, so one boolean mask covers all three checks.
+    days_left = (cards_to_display_df['Min Spend Deadline'] - today_dt).dt.days
+    active_bonus_mask = (
+        (days_left >= 0) &
         (cards_to_display_df['Bonus Status'].isin(['Not Started', 'In Progress']))
-    ].copy()
-
-    # Calculate 'Days Left' and filter out expired bonuses
-    active_bonuses_df['Days Left'] = (active_bonuses_df['Min Spend Deadline'] - today_dt).dt.days
-    active_bonuses_df = active_bonuses_df[active_bonuses_df['Days Left'] >= 0]
+    )
     
-    if active_bonuses_df.empty:
+    # Check the mask first so the common "nothing to track" case never
+    # builds (or sorts) a filtered frame at all
+    if not active_bonus_mask.any():
         st.write("No active minimum spend deadlines to track.")
     else:
         # Sort by soonest deadline first
-        active_bonuses_df = active_bonuses_df.sort_values(by='Days Left')
+        active_bonuses_df = cards_to_display_df.loc[active_bonus_mask].assign(
+            **{'Days Left': days_left[active_bonus_mask].astype(int)}
+        ).sort_values(by='Days Left')
+        
+        # Spend progress for every bonus at once. A $0 min spend has no
+        # meaningful progress, so it shows 0% (and divides by 1, not 0).
+        min_spends = active_bonuses_df['Min Spend']
+        current_spends = active_bonuses_df['Current Spend']
+        active_bonuses_df['progress_pct'] = np.where(
+            min_spends > 0,
+            np.clip(current_spends / min_spends.where(min_spends > 0, 1), 0.0, 1.0),
+            0.0,
+        )
+        active_bonuses_df['remaining_spend'] = (min_spends - current_spends).clip(lower=0.0)
+        active_bonuses_df['spend_met'] = (current_spends >= min_spends) & (min_spends > 0)
+        active_bonuses_df['deadline_str'] = active_bonuses_df['Min Spend Deadline'].dt.strftime('%d %b %Y')
         
         # Loop through each active bonus and display its status
-        for index, card in active_bonuses_df.iterrows():
+        for index, card in iter_cards(active_bonuses_df):
             days_left = card['Days Left']
             card_name_full = f"{card['Bank']} {card['Card Name']}"
             card_name_bold = f"**{card_name_full}**"
-            deadline_str = card['Min Spend Deadline'].strftime('%d %b %Y')
+            deadline_str = card['deadline_str']
             
             min_spend = card['Min Spend']
             current_spend = card['Current Spend']
-            remaining_spend = max(0.0, min_spend - current_spend)
-            progress_pct = 0.0
-            if min_spend > 0:
-                progress_pct = min(1.0, current_spend / min_spend)
+            remaining_spend = card['remaining_spend']
+            progress_pct = card['progress_pct']
             
             remaining_str = f"**${remaining_spend:,.0f} more**"
             
             # --- State 1: Spend is Met ---
-            if current_spend >= min_spend and min_spend > 0:
+            if card['spend_met']:
                 st.success(f"🎉 {card_name_bold}: You've hit the minimum spend!")
                 st.progress(1.0, text=f"${current_spend:,.0f} / ${min_spend:,.0f} spent")
                 
                 # Show a button to change status to "Met"
                 if st.button(f"Mark Bonus as 'Met'", key=f"mark_met_{index}", use_container_width=True):
-                    df = load_data()
-                    df.loc[index, "Bonus Status"] = "Met"
-                    # <--- SAFETY FIX: Added FileLock here
-                    with FileLock(LOCK_FILE):
-                        df.to_csv(DATA_FILE, index=False)
+                    update_card(index, {"Bonus Status": "Met"})
                     st.rerun() # Rerun to remove this card from the tracker
             
             # --- State 2: Spend is Not Met ---
@@ -841,38 +1482,40 @@ def show_dashboard(all_cards_df, show_cancelled):
                 st.progress(progress_pct, text=f"${current_spend:,.0f} / ${min_spend:,.0f} spent")
                 
                 # --- Mini-form to update spend ---
-                # Each card gets its own form
-                with st.form(key=f"update_spend_{index}"):
-                    st.caption("Update your total spend:")
-                    f_col1, f_col2 = st.columns([3, 1])
-                    with f_col1:
-                        new_spend = st.number_input(
-                            "Update Total Spend ($)",
-                            min_value=0.0,
-                            value=float(current_spend),
-                            step=50.0,
-                            label_visibility="collapsed"
-                        )
-                    with f_col2:
-                        updated = st.form_submit_button("Update", use_container_width=True)
-                    
-                    if updated:
-                        # On submit, load data, update the one value, save, and rerun
-                        df = load_data()
-                        # Get the current status from the card data we looped over
-                        current_status = card['Bonus Status']
-                        # If status is "Not Started" and we just added spend,
-                        # automatically change it to "In Progress".
-                        if current_status == "Not Started" and new_spend > 0:
-                            df.loc[index, "Bonus Status"] = "In Progress"
-                        # Update the spend (this was the original code)
-                        df.loc[index, "Current Spend"] = new_spend
+                # Only the card the user chose gets a form, so the tracker
+                # renders one button per bonus instead of a form for each.
+                if st.session_state.spend_to_update != index:
+                    st.button("Log Spend", key=f"log_spend_{index}", on_click=set_spend_to_update, args=(index,))
+                else:
+                    with st.form(key=f"update_spend_{index}"):
+                        st.caption("Update your total spend:")
+                        f_col1, f_col2, f_col3 = st.columns([3, 1, 1])
+                        with f_col1:
+                            new_spend = st.number_input(
+                                "Update Total Spend ($)",
+                                min_value=0.0,
+                                value=float(current_spend),
+                                step=50.0,
+                                label_visibility="collapsed"
+                            )
+                        with f_col2:
+                            updated = st.form_submit_button("Update", use_container_width=True)
+                        with f_col3:
+                            st.form_submit_button("Close", use_container_width=True, on_click=set_spend_to_update, args=(None,))
                         
-                        # <--- SAFETY FIX: Added FileLock here
-                        with FileLock(LOCK_FILE):
-                            df.to_csv(DATA_FILE, index=False)
-                        st.toast(f"Updated spend for {card_name_full}!")
-                        st.rerun() 
+                        if updated:
+                            # On submit, update the spend, save, and rerun
+                            updates = {"Current Spend": new_spend}
+                            # Get the current status from the card data we looped over
+                            current_status = card['Bonus Status']
+                            # If status is "Not Started" and we just added spend,
+                            # automatically change it to "In Progress".
+                            if current_status == "Not Started" and new_spend > 0:
+                                updates["Bonus Status"] = "In Progress"
+                            update_card(index, updates)
+                            st.session_state.spend_to_update = None # Close the form
+                            st.toast(f"Updated spend for {card_name_full}!")
+                            st.rerun() 
             st.write("") # Add blank line
             
     st.divider()
@@ -888,7 +1531,7 @@ def show_dashboard(all_cards_df, show_cancelled):
         st.info("No annual fees due this month.")
     else:
         # Loop over cards due this month
-        for index, card_data in cards_due_this_month.iterrows():
+        for index, card_data in iter_cards(cards_due_this_month):
             card_name_full = f"{card_data['Bank']} {card_data['Card Name']}"
             fee = card_data['Annual Fee']
             fee_text = f"The fee is **${fee:.2f}**." if fee > 0 else "Fee is $0, but please verify."
@@ -915,27 +1558,21 @@ def show_dashboard(all_cards_df, show_cancelled):
                 b_col1, b_col2 = st.columns(2)
                 with b_col1:
                     if st.button("I Waived This Fee", key=f"waived_{index}", use_container_width=True):
-                        df = load_data()
                         # Increment counter and set the action/year flags
-                        df.loc[index, "FeeWaivedCount"] = df.loc[index, "FeeWaivedCount"] + 1
-                        df.loc[index, "LastFeeActionYear"] = current_year
-                        df.loc[index, "LastFeeAction"] = "Waived" 
-                        
-                        # <--- SAFETY FIX: Added FileLock here
-                        with FileLock(LOCK_FILE):
-                            df.to_csv(DATA_FILE, index=False)
+                        update_card(index, {
+                            "FeeWaivedCount": card_data["FeeWaivedCount"] + 1,
+                            "LastFeeActionYear": current_year,
+                            "LastFeeAction": "Waived",
+                        })
                         st.rerun()
                 with b_col2:
                     if st.button("I Paid This Fee", key=f"paid_{index}", use_container_width=True):
-                        df = load_data()
                         # Increment counter and set the action/year flags
-                        df.loc[index, "FeePaidCount"] = df.loc[index, "FeePaidCount"] + 1
-                        df.loc[index, "LastFeeActionYear"] = current_year
-                        df.loc[index, "LastFeeAction"] = "Paid"
-                        
-                        # <--- SAFETY FIX: Added FileLock here
-                        with FileLock(LOCK_FILE):
-                            df.to_csv(DATA_FILE, index=False)
+                        update_card(index, {
+                            "FeePaidCount": card_data["FeePaidCount"] + 1,
+                            "LastFeeActionYear": current_year,
+                            "LastFeeAction": "Paid",
+                        })
                         st.rerun()
             
             st.write("") 
@@ -945,7 +1582,7 @@ def show_dashboard(all_cards_df, show_cancelled):
         st.info("No annual fees due next month.")
     else:
         # This section just shows a simple warning, no action buttons
-        for _, card_data in cards_due_next_month.iterrows():
+        for _, card_data in iter_cards(cards_due_next_month):
             fee = card_data['Annual Fee']; fee_text = f"The fee is **${fee:.2f}**." if fee > 0 else "Fee is $0, but please verify."
             st.warning(f"**{card_data['Bank']} {card_data['Card Name']}**: {fee_text}")
     st.divider()
@@ -954,46 +1591,47 @@ def show_dashboard(all_cards_df, show_cancelled):
     st.header("Re-application Notifications", anchor=False)
     st.caption("Shows cards that were cancelled and are now (or soon) eligible to re-apply for a new bonus.")
     
-    # Filter for cards that have a Re-apply Date set
-    reapply_df = all_cards_df[pd.notna(all_cards_df['Re-apply Date'])].copy()
-    # Filter for dates that are within the next 60 days (or are in the past)
-    eligible_cards = reapply_df[
-        (reapply_df['Re-apply Date'] <= today_dt + pd.DateOffset(days=60))
-    ].sort_values(by='Re-apply Date')
+    # Filter for cards with a Re-apply Date within the next 60 days
+    # (or in the past). NaT (no date set) compares False, so cards without
+    # one drop out of the same mask.
+    eligible_mask = all_cards_df['Re-apply Date'] <= today_dt + pd.DateOffset(days=60)
     
-    if eligible_cards.empty:
+    if not eligible_mask.any():
         st.write("No cards are eligible for re-application soon.")
     else:
-        for _, card in eligible_cards.iterrows():
+        eligible_cards = all_cards_df.loc[eligible_mask].sort_values(by='Re-apply Date')
+        # Work out the countdown and display date for every card at once
+        eligible_cards = eligible_cards.assign(
+            is_past=eligible_cards['Re-apply Date'] <= today_dt,
+            days_until=(eligible_cards['Re-apply Date'] - today_dt).dt.days,
+            date_str=eligible_cards['Re-apply Date'].dt.strftime('%d %b %Y'),
+        )
+        for _, card in iter_cards(eligible_cards):
             card_name = f"{card['Bank']} {card['Card Name']}"
-            reapply_date_str = card['Re-apply Date'].strftime('%d %b %Y')
             
             # If the date is in the past, show success
-            if card['Re-apply Date'] <= today_dt:
-                st.success(f"**{card_name}**: You are **now eligible** to re-apply! (Eligible since {reapply_date_str})")
+            if card['is_past']:
+                st.success(f"**{card_name}**: You are **now eligible** to re-apply! (Eligible since {card['date_str']})")
             # If the date is in the future, show info
             else:
-                days_until = (card['Re-apply Date'] - today_dt).days
-                st.info(f"**{card_name}**: Eligible to re-apply in **{days_until} days**. (On {reapply_date_str})")
+                st.info(f"**{card_name}**: Eligible to re-apply in **{card['days_until']} days**. (On {card['date_str']})")
     st.divider()
 
     # --- "All My Cards" List ---
     st.header("All My Cards", anchor=False)
-    
-    # This is a key calculation for "Sort by Due Date".
-    # It creates a 'due_sort_key' that wraps around, so if the
-    # current month is November (10), December (11) gets key 1,
-    # and January (0) gets key 2. ( (0 - 10 + 12) % 12 = 2 )
-    cards_to_display_df['due_sort_key'] = (cards_to_display_df['due_month_index'] - current_month_index + 12) % 12
 
     # --- Filters and Sort ---
     f_col1, f_col2, f_col3 = st.columns(3)
     with f_col1:
-        bank_options = sorted(cards_to_display_df['Bank'].unique())
+        bank_options = get_bank_options(cards_to_display_df, data_version, show_cancelled)
         selected_banks = st.multiselect("Filter by Bank", options=bank_options)
     with f_col2:
         tag_options = load_tags()
-        selected_tags = st.multiselect("Filter by Tag", options=tag_options)
+        if tag_options:
+            selected_tags = st.multiselect("Filter by Tag", options=tag_options)
+        else:
+            selected_tags = []
+            st.caption("No tags to filter by yet.")
     with f_col3:
         sort_options = {
             "Manual (Custom Order)": "Sort Order",
@@ -1009,221 +1647,53 @@ def show_dashboard(all_cards_df, show_cancelled):
                 st.session_state.duplicate_sort_numbers = [] 
                 st.rerun() # Go to the Sort page
     
-    # --- Apply Filters ---
-    cards_to_show_df_sorted = cards_to_display_df.copy()
-    if selected_banks:
-        # Filter DataFrame to rows where 'Bank' is in the selected list
-        cards_to_show_df_sorted = cards_to_show_df_sorted[cards_to_show_df_sorted['Bank'].isin(selected_banks)]
-    if selected_tags:
-        # This logic handles multi-tag filtering
-        def check_tags(card_tags_str):
-            card_tags = set(t.strip() for t in card_tags_str.split(','))
-            # 'all' means the card must have *every* tag in selected_tags
-            return all(tag in card_tags for tag in selected_tags)
-        
-        cards_to_show_df_sorted = cards_to_show_df_sorted[
-            cards_to_show_df_sorted['Tags'].apply(check_tags)
-        ]
-
-    # --- Apply Sort ---
-    sort_logic = sort_options[selected_sort_key]
-    if sort_logic == "Annual Fee_desc":
-        cards_to_show_df_sorted = cards_to_show_df_sorted.sort_values(by="Annual Fee", ascending=False)
-    elif sort_logic == "Annual Fee_asc":
-        cards_to_show_df_sorted = cards_to_show_df_sorted.sort_values(by="Annual Fee", ascending=True)
-    elif sort_logic == "due_sort_key":
-        # Sort by our calculated 'due_sort_key'
-        cards_to_show_df_sorted = cards_to_show_df_sorted.sort_values(by="due_sort_key", ascending=True)
-    else: # Default: "Sort Order"
-        cards_to_show_df_sorted = cards_to_show_df_sorted.sort_values(by="Sort Order", ascending=True)
-
-    # Get the Python strftime code for the user's selected date format
+    # --- Apply Filters and Sort ---
+    # Cached, so reruns that don't touch the filters (e.g. button clicks)
+    # reuse the last result. The data version stands in for the DataFrame
+    # itself in the cache key; any save changes it. It is the version
+    # all_cards_df was loaded with (from main): re-reading it here could
+    # pick up a newer file written by the bot in between, and cache these
+    # old rows under the new version.
     strftime_code = STRFTIME_MAP[st.session_state.date_format]
-    
+    cards_to_show_df_sorted = filter_and_sort(
+        cards_to_display_df,
+        data_version=data_version,
+        show_cancelled=show_cancelled,
+        current_month_index=current_month_index,
+        selected_banks=tuple(sorted(selected_banks)),
+        selected_tags=tuple(sorted(selected_tags)),
+        sort_logic=sort_options[selected_sort_key],
+        strftime_code=strftime_code,
+    )
+
     if cards_to_show_df_sorted.empty:
         st.info("No cards match your current filters.")
 
-    # Helper function to format dates for display, handling NaT (null) values
-    def format_date_display(date_val):
-        """Formats a date for display, returning an empty string if null."""
-        if pd.isna(date_val):
-            return ""
-        return pd.to_datetime(date_val).strftime(strftime_code)
+    # --- Pagination ---
+    # Only one page of cards is rendered per rerun. The page number is
+    # clamped here because a filter change can leave fewer pages than before.
+    page_count = max(1, -(-len(cards_to_show_df_sorted) // CARDS_PER_PAGE)) # Ceiling division
+    page = min(max(st.session_state.card_list_page, 0), page_count - 1)
+    st.session_state.card_list_page = page
+    page_start = page * CARDS_PER_PAGE
+    cards_on_page_df = cards_to_show_df_sorted.iloc[page_start:page_start + CARDS_PER_PAGE]
 
     # --- Main Card Loop ---
-    # This loops through the final, filtered, and sorted DataFrame
-    # and displays one card at a time.
-    for index, card_row in cards_to_show_df_sorted.iterrows():
-        st.divider()
-        col1, col2 = st.columns([1, 3])
-
-        with col1: # Image column
-            image_path = os.path.join(IMAGE_DIR, str(card_row["Image Filename"]))
-            if not os.path.exists(image_path): 
-                image_path = os.path.join(IMAGE_DIR, DEFAULT_IMAGE)
-            if os.path.exists(image_path): 
-                st.image(image_path)
-            else: 
-                st.caption("No Image")
-
-        with col2: # Info column
-            
-            # --- Title/Expiry UI ---
-            title_text = f"{card_row['Bank']} {card_row['Card Name']}"
-            last_4 = card_row.get("Last 4 Digits", "")
-            if last_4:
-                title_text += f" ({last_4})" # Add (1234) if it exists
-            expiry_text = f"<b>Card Expiry:</b> {card_row['Card Expiry (MM/YY)']}"
-            
-            # This custom HTML places the Title on the left and Expiry on the right
-            st.markdown(
-                f"""
-                <div style="display: flex; justify-content: space-between; align-items: baseline; margin-bottom: -10px;">
-                    <h3 style="margin-bottom: 0px;">{title_text}</h3>
-                    <span style="opacity: 0.8; white-space: nowrap;">{expiry_text}</span>
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
-
-            is_cancelled = pd.notna(card_row["Cancellation Date"])
-            
-            if is_cancelled:
-                # --- Cancelled Card View ---
-                st.error("Status: Cancelled")
-                c_col1, c_col2 = st.columns(2)
-                with c_col1:
-                    st.metric("Cancelled On", pd.to_datetime(card_row["Cancellation Date"]).strftime("%d %b %Y"))
-                with c_col2:
-                    st.metric("Re-apply After", pd.to_datetime(card_row["Re-apply Date"]).strftime("%d %b %Y"))
-            else:
-                # --- Active Card View ---
-                st.metric(label="Annual Fee", value=f"${card_row['Annual Fee']:.2f}")
-
-            # --- Due date status ---
-            due_month_name = card_row['Month of Annual Fee']
-            due_month_index = card_row['due_month_index'] 
-            if not is_cancelled:
-                if due_month_index == current_month_index:
-                    st.error(f"❗ **Due this month** ({due_month_name})")
-                elif due_month_index == next_month_index:
-                    st.warning(f"⚠️ **Due next month** ({due_month_name})")
-                elif due_month_index != -1:
-                    st.info(f"✅ Due in {due_month_name}")
-                else:
-                    st.info(f"Due in {due_month_name}") # Fallback
-            
-            # Display tags if they exist
-            tags_str = card_row.get("Tags", "")
-            if tags_str:
-                st.markdown(f"**Tags:** `{tags_str.replace(',', ', ')}`")
-
-            # Display notes if they exist
-            notes = card_row.get("Notes", "")
-            if notes and pd.notna(notes):
-                st.markdown("**Notes:**")
-                st.markdown(notes)
-
-            # --- Button Bar ---
-            st.write("")  # Spacer
-            
-            # <--- LAYOUT FIX: Use equal widths and container_width=True
-            b_col1, b_col2, b_col3, b_col4 = st.columns([1, 1, 1, 1])
-            
-            with b_col1: # Details button
-                if st.button("Details", key=f"details_{index}", use_container_width=True):
-                    # "Go" to the details page by setting its flag and the card index
-                    st.session_state.card_to_view = index; st.session_state.show_details_page = True; st.session_state.card_to_edit = None; st.session_state.card_to_delete = None; st.rerun()
-            
-            with b_col2: # Edit button
-                if st.button("Edit", key=f"edit_{index}", use_container_width=True):
-                    # "Go" to the edit page
-                    st.session_state.card_to_edit = index; st.session_state.show_edit_form = True; st.session_state.card_to_delete = None
-                    st.session_state.edit_form_loaded = False # Reset edit form preview
-                    st.rerun()
-            
-            with b_col3: # Cancel/Re-activate button
-                if is_cancelled:
-                    # --- Re-activate Button ---
-                    if st.button("Re-activate", key=f"reactivate_{index}", use_container_width=True):
-                        df = load_data()
-                        # Clear the cancellation/re-apply dates
-                        df.loc[index, "Cancellation Date"] = pd.NaT
-                        df.loc[index, "Re-apply Date"] = pd.NaT
-                        # Reset the fee action year so it shows as due again
-                        df.loc[index, "LastFeeActionYear"] = 0
-                        df.loc[index, "LastFeeAction"] = ""
-                        
-                        # <--- SAFETY FIX: Added FileLock here
-                        with FileLock(LOCK_FILE):
-                            df.to_csv(DATA_FILE, index=False)
-                        st.success(f"Re-activated {card_row['Bank']} {card_row['Card Name']}.")
-                        st.rerun()
-                else:
-                    # --- Cancel Button (2-step) ---
-                    # Step 1: User clicks "Cancel Card"
-                    # We set 'card_to_delete' to this card's index
-                    if st.session_state.card_to_delete == index:
-                        # Step 2: The page reruns, and now this block is active
-                        # Show the confirmation buttons
-                        if st.button("Confirm Cancel", key=f"confirm_cancel_{index}", type="primary", use_container_width=True):
-                            df = load_data()
-                            cancel_date = pd.to_datetime('today')
-                            # Set re-apply to 13 months from now (a safe buffer)
-                            reapply_date = cancel_date + DateOffset(months=13)
-                            df.loc[index, "Cancellation Date"] = cancel_date
-                            df.loc[index, "Re-apply Date"] = reapply_date
-                            
-                            # <--- SAFETY FIX: Added FileLock here
-                            with FileLock(LOCK_FILE):
-                                df.to_csv(DATA_FILE, index=False)
-                            st.session_state.card_to_delete = None # Clear state
-                            st.success(f"Cancelled {card_row['Bank']} {card_row['Card Name']}.")
-                            st.rerun()
-                        if st.button("Cancel Action", key=f"cancel_cancel_{index}", use_container_width=True):
-                            st.session_state.card_to_delete = None; st.rerun() # Clear state
-                    else:
-                        # Step 1: Show the initial "Cancel Card" button
-                        if st.button("Cancel Card", key=f"cancel_{index}", use_container_width=True):
-                            st.session_state.card_to_delete = index; st.session_state.card_to_edit = None; st.rerun()
-            
-            with b_col4: # Delete button (2-step)
-                # This uses a *different* session state key per card for confirmation
-                if st.session_state.get(f"confirm_permanent_delete_{index}", False):
-                    # Step 2: Show confirmation buttons
-                    if st.button("CONFIRM DELETE", key=f"confirm_delete_permanent_{index}", type="primary", use_container_width=True):
-                        df = load_data()
-                        # Use .drop() to permanently remove the row
-                        df = df.drop(index).reset_index(drop=True)
-                        
-                        # <--- SAFETY FIX: Added FileLock here
-                        with FileLock(LOCK_FILE):
-                            df.to_csv(DATA_FILE, index=False)
-                        st.session_state[f"confirm_permanent_delete_{index}"] = False 
-                        st.success(f"Permanently deleted {card_row['Bank']} {card_row['Card Name']}.")
-                        st.rerun()
-                    if st.button("No, Keep Card", key=f"cancel_delete_permanent_{index}", use_container_width=True):
-                        st.session_state[f"confirm_permanent_delete_{index}"] = False 
-                        st.rerun()
-                else:
-                    # Step 1: Show initial "Delete" button
-                    if st.button("Delete Permanently", key=f"delete_permanent_{index}", use_container_width=True):
-                        st.session_state[f"confirm_permanent_delete_{index}"] = True 
-                        st.session_state.card_to_edit = None # Clear other states
-                        st.session_state.card_to_delete = None 
-                        st.rerun()
-
-            # --- Expander for Other Dates ---
-            with st.expander("Show All Dates and Details"):
-                d_col1, d_col2, d_col3 = st.columns(3)
-                with d_col1:
-                    st.metric("Date Applied", format_date_display(card_row["Date Applied"]))
-                    st.metric("Date Approved", format_date_display(card_row["Date Approved"]))
-                with d_col2:
-                    st.metric("Date Received", format_date_display(card_row["Date Received Card"]))
-                    st.metric("Date Activated", format_date_display(card_row["Date Activated Card"]))
-                with d_col3:
-                    st.metric("First Charge Date", format_date_display(card_row["First Charge Date"]))
+    # This loops through the current page of the filtered, sorted
+    # DataFrame and displays one card at a time.
+    for index, card_row in iter_cards(cards_on_page_df):
+        render_card(index, card_row, current_month_index, next_month_index)
+
+    if page_count > 1:
+        p_col1, p_col2, p_col3 = st.columns([1, 2, 1])
+        with p_col1:
+            st.button("◀ Previous", key="card_list_prev", use_container_width=True,
+                      disabled=page == 0, on_click=change_card_list_page, args=(-1,))
+        with p_col2:
+            st.caption(f"Page {page + 1} of {page_count} ({len(cards_to_show_df_sorted)} cards)")
+        with p_col3:
+            st.button("Next ▶", key="card_list_next", use_container_width=True,
+                      disabled=page == page_count - 1, on_click=change_card_list_page, args=(1,))
 
 
 # =============================================================================
@@ -1273,13 +1743,15 @@ def show_sort_order_form():
     # --- Form Submission Logic ---
     if submitted:
         # 1. Check for Duplicates
-        all_new_orders = []
-        for index in active_cards_df.index:
-            # Read all the new order numbers from the form (via session state)
-            all_new_orders.append(st.session_state[f"sort_{index}"])
+        active_indices = tuple(active_cards_df.index)
+        # Read all the new order numbers from the form (via session state)
+        all_new_orders = [st.session_state[f"sort_{index}"] for index in active_indices]
         
-        # Use Counter to find items that appear more than once
-        duplicates = [item for item, count in Counter(all_new_orders).items() if count > 1]
+        if len(set(all_new_orders)) == len(all_new_orders):
+            duplicates = [] # All unique: the usual case, no need to count
+        else:
+            # Use Counter to find items that appear more than once
+            duplicates = [item for item, count in Counter(all_new_orders).items() if count > 1]
         
         if duplicates:
             # If duplicates found:
@@ -1293,13 +1765,10 @@ def show_sort_order_form():
             df_to_save = load_data() # Load the *full* DataFrame
             
             # Loop *only* over the active cards and update their Sort Order
-            for index in active_cards_df.index:
-                new_order = st.session_state[f"sort_{index}"]
-                df_to_save.loc[index, "Sort Order"] = new_order
+            for index, new_order in zip(active_indices, all_new_orders):
+                df_to_save.at[index, "Sort Order"] = new_order
             
-            # <--- SAFETY FIX: Added FileLock here
-            with FileLock(LOCK_FILE):
-                df_to_save.to_csv(DATA_FILE, index=False)
+            save_data_to_csv(df_to_save)
             st.success("Card order saved!")
             st.session_state.show_sort_form = False # Go back to dashboard
             st.rerun()
@@ -1334,21 +1803,21 @@ def show_details_page():
     
     st.divider()
     
+    # Format all of this card's dates in one vectorized strftime call,
+    # showing an empty string for dates that aren't set (NaT)
     strftime_code = STRFTIME_MAP[st.session_state.date_format]
-    def format_date_display(date_val):
-        """Formats a date for display, returning an empty string if null."""
-        if pd.isna(date_val):
-            return ""
-        return pd.to_datetime(date_val).strftime(strftime_code)
+    card_dates = pd.DatetimeIndex([card[col] for col in DATE_COLUMNS])
+    date_display = dict(zip(
+        DATE_COLUMNS,
+        np.where(card_dates.isna(), "", card_dates.strftime(strftime_code)),
+    ))
 
     # --- Main Details ---
     col1, col2 = st.columns([1, 2])
     with col1:
         # Show card image
-        image_path = os.path.join(IMAGE_DIR, str(card["Image Filename"]))
-        if not os.path.exists(image_path): 
-            image_path = os.path.join(IMAGE_DIR, DEFAULT_IMAGE)
-        if os.path.exists(image_path): 
+        image_path = image_path_or_default(card["Image Filename"])
+        if image_path: 
             st.image(image_path)
         else: 
             st.caption("No Image")
@@ -1361,13 +1830,16 @@ def show_details_page():
             title_text += f" ({last_4})"
         st.subheader(title_text, anchor=False)
         
-        st.markdown(f"**Annual Fee:** ${card['Annual Fee']:.2f}")
-        st.markdown(f"**Fee Month:** {card['Month of Annual Fee']}")
-        st.markdown(f"**Card Expiry:** {card['Card Expiry (MM/YY)']}")
-
+        # One markdown block (one paragraph per line) instead of a call per field
+        info_lines = [
+            f"**Annual Fee:** ${card['Annual Fee']:.2f}",
+            f"**Fee Month:** {card['Month of Annual Fee']}",
+            f"**Card Expiry:** {card['Card Expiry (MM/YY)']}",
+        ]
         tags_str = card.get("Tags", "")
         if tags_str:
-            st.markdown(f"**Tags:** `{tags_str.replace(',', ', ')}`")
+            info_lines.append(f"**Tags:** `{tags_str.replace(',', ', ')}`")
+        st.markdown("\n\n".join(info_lines))
 
     # --- Notes ---
     notes = card.get("Notes", "")
@@ -1391,7 +1863,7 @@ def show_details_page():
         b_col2.metric("Min Spend", f"${min_spend:,.2f}")
         b_col3.metric("Bonus Status", card.get("Bonus Status", "N/A"))
         
-        st.metric("Min Spend Deadline", format_date_display(card["Min Spend Deadline"]))
+        st.metric("Min Spend Deadline", date_display["Min Spend Deadline"])
         
         if min_spend > 0:
             # Show progress bar
@@ -1414,13 +1886,13 @@ def show_details_page():
     st.subheader("Card Dates", anchor=False)
     d_col1, d_col2, d_col3 = st.columns(3)
     with d_col1:
-        st.metric("Date Applied", format_date_display(card["Date Applied"]))
-        st.metric("Date Approved", format_date_display(card["Date Approved"]))
+        st.metric("Date Applied", date_display["Date Applied"])
+        st.metric("Date Approved", date_display["Date Approved"])
     with d_col2:
-        st.metric("Date Received", format_date_display(card["Date Received Card"]))
-        st.metric("Date Activated", format_date_display(card["Date Activated Card"]))
+        st.metric("Date Received", date_display["Date Received Card"])
+        st.metric("Date Activated", date_display["Date Activated Card"])
     with d_col3:
-        st.metric("First Charge Date", format_date_display(card["First Charge Date"]))
+        st.metric("First Charge Date", date_display["First Charge Date"])
 
     # --- Cancellation Info ---
     # This section only appears if the card *is* cancelled
@@ -1428,8 +1900,8 @@ def show_details_page():
         st.divider()
         st.subheader("Cancellation Info", anchor=False)
         c_col1, c_col2 = st.columns(2)
-        c_col1.metric("Cancelled On", format_date_display(card["Cancellation Date"]))
-        c_col2.metric("Re-apply After", format_date_display(card["Re-apply Date"]))
+        c_col1.metric("Cancelled On", date_display["Cancellation Date"])
+        c_col2.metric("Re-apply After", date_display["Re-apply Date"])
 
 
 # =============================================================================
@@ -1490,20 +1962,21 @@ def show_tag_manager_page():
                 # This is an important step. If we delete a tag,
                 # it should also be removed from any card that was using it.
                 df = load_data()
-                def remove_deleted_tags(tags_str):
-                    # Convert "tag1,tag2,tag3" into a list
-                    tags_list = [t.strip() for t in tags_str.split(',') if t.strip()]
-                    # Filter the list, keeping only tags that were *not* deleted
-                    cleaned_list = [t for t in tags_list if t not in tags_to_delete]
-                    # Join back into a string
-                    return ",".join(cleaned_list)
-                
-                # Apply this cleaning function to the "Tags" column
-                df["Tags"] = df["Tags"].apply(remove_deleted_tags)
-                
-                # <--- SAFETY FIX: Added FileLock here
-                with FileLock(LOCK_FILE):
-                    df.to_csv(DATA_FILE, index=False)
+                # Only cards that actually use a deleted tag need rewriting;
+                # if there are none, the CSV is left untouched.
+                deleted_tag_set = frozenset(tags_to_delete)
+                uses_deleted = ~df[TAG_SET_COLUMN].map(deleted_tag_set.isdisjoint).astype(bool)
+                if uses_deleted.any():
+                    # Convert "tag1,tag2,tag3" into one row per (card, tag)
+                    card_tags = df.loc[uses_deleted, "Tags"].str.split(',').explode().str.strip()
+                    # Keep only tags that were *not* deleted (and drop blanks)
+                    card_tags = card_tags[(card_tags != "") & ~card_tags.isin(deleted_tag_set)]
+                    # Join back into one string per card; cards left with no tags get ""
+                    df.loc[uses_deleted, "Tags"] = (
+                        card_tags.groupby(level=0).agg(",".join)
+                        .reindex(df.index[uses_deleted], fill_value="")
+                    )
+                    save_data_to_csv(df)
                 st.rerun() # Rerun to show the updated tag list
         elif submitted_delete:
             st.warning("Please select at least one tag to delete.")
@@ -1563,12 +2036,6 @@ def main():
     </style>
     """, unsafe_allow_html=True)
 
-    # --- Load Data ---
-    # Load the data once here. It will be passed to the dashboard
-    # or re-loaded by the other pages if they need to make changes.
-    all_cards_df = load_data()
-    card_mapping = get_card_mapping()
-    
     # --- Persistent Sidebar ---
     # This sidebar code is now in main(), so it appears on *all pages*
 
@@ -1584,12 +2051,13 @@ def main():
         # Reset any "context" flags
         st.session_state.card_to_edit = None
         st.session_state.card_to_view = None
-        st.session_state.card_to_delete = None
+        st.session_state.spend_to_update = None
+        clear_per_card_state() # Cancel/Delete confirmations, sort page inputs
         
         # Reset any form-specific states for a clean return
         st.session_state.duplicate_sort_numbers = []
         st.session_state.uploaded_image_preview = None
-        st.session_state.image_uploader_key = str(datetime.now().timestamp())
+        st.session_state.image_uploader_key = str(time.time())
         
         # Rerun to refresh the page to the dashboard
         st.rerun()
@@ -1611,7 +2079,7 @@ def main():
     
     # Export data button
     try:
-        csv_data = all_cards_df.to_csv(index=False).encode('utf-8')
+        csv_data = get_export_csv_bytes(get_data_version())
         st.sidebar.download_button(
             label="Export Card Data (CSV)", data=csv_data,
             file_name="my_cards_backup.csv", mime="text/csv",
@@ -1624,25 +2092,31 @@ def main():
     # --- Page Routing Logic ---
     # This is the "router" for the single-page app.
     # It checks the session state flags (which are True/False)
-    # in order, and runs the function for the *first* flag it
-    # finds that is True.
+    # in order, runs the function for the *first* flag it
+    # finds that is True, and returns early.
+    # Each page loads only what it needs: the card mapping is
+    # only built for the add form, and the pages that edit cards
+    # re-load the data themselves.
     # If all flags are False, it shows the default dashboard.
     if st.session_state.show_add_form:
-        show_add_card_form(card_mapping)
-        
-    elif st.session_state.show_edit_form:
+        show_add_card_form(get_card_mapping())
+        return
+    if st.session_state.show_edit_form:
         show_edit_form()
-        
-    elif st.session_state.show_sort_form:
+        return
+    if st.session_state.show_sort_form:
         show_sort_order_form()
-        
-    elif st.session_state.show_details_page:
+        return
+    if st.session_state.show_details_page:
         show_details_page()
-        
-    elif st.session_state.show_tag_manager:
+        return
+    if st.session_state.show_tag_manager:
         show_tag_manager_page()
-        
-    elif all_cards_df.empty:
+        return
+
+    data_version = get_data_version() # Read once: the dashboard's cache key must match the data
+    all_cards_df = load_data(data_version)
+    if all_cards_df.empty:
         # --- "Empty State" Page ---
         # If no flags are set AND the dataframe is empty,
         # show a special "Welcome" page.
@@ -1653,10 +2127,11 @@ def main():
                 st.session_state.show_add_form = True
                 st.session_state.add_form_loaded = False # Reset add form
                 st.rerun()
-    else:
-        # --- Default Page ---
-        # If no other page flag is set, show the main dashboard.
-        show_dashboard(all_cards_df, show_cancelled)
+        return
+
+    # --- Default Page ---
+    # If no other page flag is set, show the main dashboard.
+    show_dashboard(all_cards_df, data_version, show_cancelled)
 
 # Standard Python entry point
 if __name__ == "__main__":